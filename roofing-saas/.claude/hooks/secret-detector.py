@@ -43,23 +43,43 @@ SECRET_PATTERNS: List[Tuple[str, str]] = [
      "Supabase JWT (verify if service_role key)"),
 ]
 
-# Allowlist patterns (if prompt contains these, likely explaining/discussing, not exposing)
-ALLOWLIST_PATTERNS = [
-    r"(?i)example[:\s]",
-    r"(?i)placeholder",
-    r"(?i)redacted",
-    r"(?i)\[YOUR_.*\]",
-    r"(?i)<.*_KEY>",
-    r"(?i)REPLACE_WITH",
-]
+# Every prompt was scanned once per pattern; combining them into a single
+# alternation makes it one pass regardless of how many patterns accumulate.
+# Each pattern gets a named group so the match maps back to its description.
+# Leading (?i) flags are stripped - the combined scan is IGNORECASE anyway,
+# matching the old per-pattern behavior, and Python rejects mid-pattern
+# global flags.
+COMBINED_PATTERN = re.compile(
+    "|".join(
+        f"(?P<g{i}>{pattern.removeprefix('(?i)')})"
+        for i, (pattern, _) in enumerate(SECRET_PATTERNS)
+    ),
+    re.IGNORECASE | re.MULTILINE,
+)
+DESCRIPTIONS = [description for _, description in SECRET_PATTERNS]
+
+# Shortest text any pattern can match - the URL-with-credentials pattern
+# fires on e.g. "http://a:b@x" at 11 chars. Prompts below this can't contain
+# a secret, so the scan is skipped with one length compare. Re-derive this
+# minimum whenever SECRET_PATTERNS changes: too high silently disables
+# detections.
+MIN_SECRET_LEN = 11
+
+# Allowlist (if prompt contains these, likely explaining/discussing, not
+# exposing). The plain-word triggers use a casefolded substring scan, which
+# is far cheaper than the regex engine; "example" requires a trailing
+# delimiter (so "examples"/"counterexample" don't bypass the scan) and stays
+# in the regex alongside the structural patterns.
+LITERAL_ALLOWLIST = ("placeholder", "redacted", "replace_with")
+ALLOWLIST_PATTERN = re.compile(r"example[:\s]|\[YOUR_.*\]|<.*_KEY>", re.IGNORECASE)
 
 
 def is_likely_example(prompt: str) -> bool:
     """Check if the prompt appears to be discussing/explaining rather than exposing."""
-    for pattern in ALLOWLIST_PATTERNS:
-        if re.search(pattern, prompt):
-            return True
-    return False
+    folded = prompt.casefold()
+    if any(literal in folded for literal in LITERAL_ALLOWLIST):
+        return True
+    return ALLOWLIST_PATTERN.search(prompt) is not None
 
 
 def detect_secrets(prompt: str) -> List[Tuple[str, str]]:
@@ -69,17 +89,20 @@ def detect_secrets(prompt: str) -> List[Tuple[str, str]]:
     """
     findings = []
 
+    # Too short to hold any secret - skip the scan entirely
+    if len(prompt) < MIN_SECRET_LEN:
+        return findings
+
     # Skip if this appears to be an example/discussion
     if is_likely_example(prompt):
         return findings
 
-    for pattern, description in SECRET_PATTERNS:
-        matches = re.finditer(pattern, prompt, re.IGNORECASE | re.MULTILINE)
-        for match in matches:
-            matched_text = match.group(0)
-            # Truncate long matches for preview
-            preview = matched_text[:50] + "..." if len(matched_text) > 50 else matched_text
-            findings.append((description, preview))
+    for match in COMBINED_PATTERN.finditer(prompt):
+        description = DESCRIPTIONS[int(match.lastgroup[1:])]
+        matched_text = match.group(0)
+        # Truncate long matches for preview
+        preview = matched_text[:50] + "..." if len(matched_text) > 50 else matched_text
+        findings.append((description, preview))
 
     return findings
 
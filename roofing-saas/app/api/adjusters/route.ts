@@ -69,8 +69,10 @@ export const GET = withAuth(async (request: NextRequest, { tenantId }: AuthConte
 
     // Search by name
     if (search) {
+      // Escape SQL wildcards to prevent unexpected matches
+      const escapedSearch = search.replace(/[%_\\]/g, '\\$&')
       query = query.or(
-        `first_name.ilike.%${search}%,last_name.ilike.%${search}%`
+        `first_name.ilike.%${escapedSearch}%,last_name.ilike.%${escapedSearch}%`
       )
     }
 
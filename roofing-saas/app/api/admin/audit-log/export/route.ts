@@ -90,10 +90,12 @@ export const GET = withAuth(async (request: NextRequest, { user, tenantId }) =>
 
     // Search across user name, email, and entity ID
     if (filters.search) {
+      // Escape SQL wildcards to prevent unexpected matches
+      const escapedSearch = filters.search.replace(/[%_\\]/g, '\\$&')
       query = query.or(
-        `user_name.ilike.%${filters.search}%,` +
-        `user_email.ilike.%${filters.search}%,` +
-        `entity_id.ilike.%${filters.search}%`
+        `user_name.ilike.%${escapedSearch}%,` +
+        `user_email.ilike.%${escapedSearch}%,` +
+        `entity_id.ilike.%${escapedSearch}%`
       )
     }
 
@@ -264,10 +266,12 @@ export const POST = withAuth(async (request: NextRequest, { user, tenantId }) =>
 
     // Search
     if (filters.search) {
+      // Escape SQL wildcards to prevent unexpected matches
+      const escapedSearch = filters.search.replace(/[%_\\]/g, '\\$&')
       query = query.or(
-        `user_name.ilike.%${filters.search}%,` +
-        `user_email.ilike.%${filters.search}%,` +
-        `entity_id.ilike.%${filters.search}%`
+        `user_name.ilike.%${escapedSearch}%,` +
+        `user_email.ilike.%${escapedSearch}%,` +
+        `entity_id.ilike.%${escapedSearch}%`
       )
     }
 
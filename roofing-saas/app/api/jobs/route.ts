@@ -32,7 +32,9 @@ export const GET = withAuth(async (request: NextRequest, { tenantId }) => {
     if (projectId) query = query.eq('project_id', projectId)
     if (crewLead) query = query.eq('crew_lead', crewLead)
     if (search) {
-      query = query.or(`job_number.ilike.%${search}%,scope_of_work.ilike.%${search}%`)
+      // Escape SQL wildcards to prevent unexpected matches
+      const escapedSearch = search.replace(/[%_\\]/g, '\\$&')
+      query = query.or(`job_number.ilike.%${escapedSearch}%,scope_of_work.ilike.%${escapedSearch}%`)
     }
 
     query = query
@@ -5,7 +5,7 @@
 
 import { createClient } from '@/lib/supabase/server'
 import { withAuth } from '@/lib/auth/with-auth'
-import { generateKnowledgeEmbedding } from '@/lib/embeddings'
+import { generateKnowledgeEmbedding, serializeEmbedding } from '@/lib/embeddings'
 import { incrementAiUsage, calculateEmbeddingCostCents } from '@/lib/billing/ai-usage'
 import { logger } from '@/lib/logger'
 import { AuthorizationError, ValidationError, InternalError } from '@/lib/api/errors'
@@ -91,7 +91,7 @@ export const POST = withAuth(async (request, { userId, tenantId }) => {
     if (generate_embedding) {
       const embeddingResult = await generateKnowledgeEmbedding(title, content)
       if (embeddingResult) {
-        embedding = JSON.stringify(embeddingResult.embedding)
+        embedding = serializeEmbedding(embeddingResult.embedding)
         // Track embedding token usage (fire-and-forget)
         if (embeddingResult.tokens > 0) {
           const costCents = calculateEmbeddingCostCents(embeddingResult.tokens)
@@ -172,7 +172,7 @@ export const PATCH = withAuth(async (request, { userId, tenantId }) => {
 
         const embeddingResult = await generateKnowledgeEmbedding(title, content)
         if (embeddingResult) {
-          updates.embedding = JSON.stringify(embeddingResult.embedding)
+          updates.embedding = serializeEmbedding(embeddingResult.embedding)
           // Track embedding token usage (fire-and-forget)
           if (embeddingResult.tokens > 0) {
             const costCents = calculateEmbeddingCostCents(embeddingResult.tokens)
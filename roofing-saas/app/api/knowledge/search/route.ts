@@ -5,7 +5,7 @@
 
 import { createClient } from '@/lib/supabase/server'
 import { withAuth } from '@/lib/auth/with-auth'
-import { generateEmbedding } from '@/lib/embeddings'
+import { generateEmbedding, serializeEmbedding } from '@/lib/embeddings'
 import { incrementAiUsage, calculateEmbeddingCostCents } from '@/lib/billing/ai-usage'
 import { logger } from '@/lib/logger'
 import { ValidationError, InternalError } from '@/lib/api/errors'
@@ -13,8 +13,6 @@ import { successResponse, errorResponse } from '@/lib/api/response'
 
 export const POST = withAuth(async (request, { userId, tenantId }) => {
   try {
-    const supabase = await createClient()
-
     const body = await request.json()
     const { query, category, threshold = 0.7, limit = 5 } = body
 
@@ -22,13 +20,20 @@ export const POST = withAuth(async (request, { userId, tenantId }) => {
       throw ValidationError('Query text is required')
     }
 
-    // Generate embedding for query
-    const embeddingResult = await generateEmbedding(query)
+    // Client setup and query embedding are independent - run them in parallel
+    const [supabase, embeddingResult] = await Promise.all([
+      createClient(),
+      generateEmbedding(query),
+    ])
 
     if (!embeddingResult) {
       throw InternalError('Failed to generate query embedding')
     }
 
+    // Serialize the 1536-float vector once; it's sent to both the search RPC
+    // and the analytics insert
+    const queryVector = serializeEmbedding(embeddingResult.embedding)
+
     // Track embedding token usage (fire-and-forget)
     if (embeddingResult.tokens > 0) {
       const costCents = calculateEmbeddingCostCents(embeddingResult.tokens)
@@ -41,7 +46,7 @@ export const POST = withAuth(async (request, { userId, tenantId }) => {
     const { data: results, error: searchError } = await supabase.rpc(
       'search_roofing_knowledge',
       {
-        query_embedding: JSON.stringify(embeddingResult.embedding),
+        query_embedding: queryVector,
         match_threshold: threshold,
         match_count: limit,
         filter_category: category || null,
@@ -54,16 +59,18 @@ export const POST = withAuth(async (request, { userId, tenantId }) => {
       throw InternalError('Search failed')
     }
 
-    // Log search query for analytics
+    // Log search query for analytics (fire-and-forget - don't hold up the response)
     const searchResults = results as { id: string; similarity: number }[] | null
-    await supabase.from('knowledge_search_queries').insert({
+    supabase.from('knowledge_search_queries').insert({
       tenant_id: tenantId,
       user_id: userId,
       query_text: query,
-      query_embedding: JSON.stringify(embeddingResult.embedding),
+      query_embedding: queryVector,
       results_count: searchResults?.length ?? 0,
       top_result_id: searchResults && searchResults.length > 0 ? searchResults[0].id : null,
       relevance_score: searchResults && searchResults.length > 0 ? searchResults[0].similarity : null,
+    }).then(({ error: logError }) => {
+      if (logError) logger.error('Failed to log search query', { error: logError })
     })
 
     return successResponse({
@@ -38,7 +38,9 @@ export const GET = withAuth(async (request: NextRequest, { userId, tenantId }) =
     const searchPromises = []
 
     // Search pattern for ILIKE queries
-    const searchPattern = `%${query.toLowerCase()}%`
+    // Escape SQL wildcards to prevent unexpected matches
+    const escapedQuery = query.toLowerCase().replace(/[%_\\]/g, '\\$&')
+    const searchPattern = `%${escapedQuery}%`
 
     // 1. Search Contacts (most common search)
     searchPromises.push(
@@ -32,18 +32,77 @@ export const GET = withAuth(async (request: NextRequest, { tenantId }) => {
     const results: SearchResult[] = []
 
     // Search query (case-insensitive pattern)
-    const searchPattern = `%${query.toLowerCase()}%`
-
-    // 1. Search Contacts
-    const { data: contacts } = await supabase
-      .from('contacts')
-      .select('id, first_name, last_name, email, phone, stage')
-      .eq('tenant_id', tenantId)
-      .eq('is_deleted', false)
-      .or(
-        `first_name.ilike.${searchPattern},last_name.ilike.${searchPattern},email.ilike.${searchPattern},phone.ilike.${searchPattern}`
-      )
-      .limit(10)
+    // Escape SQL wildcards to prevent unexpected matches
+    const escapedQuery = query.toLowerCase().replace(/[%_\\]/g, '\\$&')
+    const searchPattern = `%${escapedQuery}%`
+
+    // The six entity searches are independent, so run them concurrently -
+    // response time is the slowest probe instead of the sum of all six
+    const [
+      { data: contacts },
+      { data: projects },
+      { data: jobs },
+      { data: territories },
+      { data: files },
+      { data: callLogs },
+    ] = await Promise.all([
+      // 1. Search Contacts
+      supabase
+        .from('contacts')
+        .select('id, first_name, last_name, email, phone, stage')
+        .eq('tenant_id', tenantId)
+        .eq('is_deleted', false)
+        .or(
+          `first_name.ilike.${searchPattern},last_name.ilike.${searchPattern},email.ilike.${searchPattern},phone.ilike.${searchPattern}`
+        )
+        .limit(10),
+      // 2. Search Projects
+      supabase
+        .from('projects')
+        .select('id, name, project_number, status, estimated_value')
+        .eq('tenant_id', tenantId)
+        .eq('is_deleted', false)
+        .or(
+          `name.ilike.${searchPattern},project_number.ilike.${searchPattern},description.ilike.${searchPattern}`
+        )
+        .limit(10),
+      // 3. Search Jobs
+      supabase
+        .from('jobs')
+        .select('id, job_number, job_type, status, scheduled_date')
+        .eq('tenant_id', tenantId)
+        .eq('is_deleted', false)
+        .or(
+          `job_number.ilike.${searchPattern},scope_of_work.ilike.${searchPattern}`
+        )
+        .limit(10),
+      // 4. Search Territories
+      supabase
+        .from('territories')
+        .select('id, name, description')
+        .eq('tenant_id', tenantId)
+        .eq('is_deleted', false)
+        .or(
+          `name.ilike.${searchPattern},description.ilike.${searchPattern}`
+        )
+        .limit(10),
+      // 5. Search Files/Documents
+      supabase
+        .from('documents')
+        .select('id, name, type, entity_type, entity_id')
+        .eq('tenant_id', tenantId)
+        .ilike('name', searchPattern)
+        .limit(10),
+      // 6. Search Call Logs
+      supabase
+        .from('call_logs')
+        .select('id, direction, duration, notes, created_at')
+        .eq('tenant_id', tenantId)
+        .or(
+          `notes.ilike.${searchPattern},from_number.ilike.${searchPattern},to_number.ilike.${searchPattern}`
+        )
+        .limit(10),
+    ])
 
     if (contacts) {
       contacts.forEach((contact) => {
@@ -58,17 +117,6 @@ export const GET = withAuth(async (request: NextRequest, { tenantId }) => {
       })
     }
 
-    // 2. Search Projects
-    const { data: projects } = await supabase
-      .from('projects')
-      .select('id, name, project_number, status, estimated_value')
-      .eq('tenant_id', tenantId)
-      .eq('is_deleted', false)
-      .or(
-        `name.ilike.${searchPattern},project_number.ilike.${searchPattern},description.ilike.${searchPattern}`
-      )
-      .limit(10)
-
     if (projects) {
       projects.forEach((project) => {
         results.push({
@@ -82,17 +130,6 @@ export const GET = withAuth(async (request: NextRequest, { tenantId }) => {
       })
     }
 
-    // 3. Search Jobs
-    const { data: jobs } = await supabase
-      .from('jobs')
-      .select('id, job_number, job_type, status, scheduled_date')
-      .eq('tenant_id', tenantId)
-      .eq('is_deleted', false)
-      .or(
-        `job_number.ilike.${searchPattern},scope_of_work.ilike.${searchPattern}`
-      )
-      .limit(10)
-
     if (jobs) {
       jobs.forEach((job) => {
         results.push({
@@ -106,17 +143,6 @@ export const GET = withAuth(async (request: NextRequest, { tenantId }) => {
       })
     }
 
-    // 4. Search Territories
-    const { data: territories } = await supabase
-      .from('territories')
-      .select('id, name, description')
-      .eq('tenant_id', tenantId)
-      .eq('is_deleted', false)
-      .or(
-        `name.ilike.${searchPattern},description.ilike.${searchPattern}`
-      )
-      .limit(10)
-
     if (territories) {
       territories.forEach((territory) => {
         results.push({
@@ -130,14 +156,6 @@ export const GET = withAuth(async (request: NextRequest, { tenantId }) => {
       })
     }
 
-    // 5. Search Files/Documents
-    const { data: files } = await supabase
-      .from('documents')
-      .select('id, name, type, entity_type, entity_id')
-      .eq('tenant_id', tenantId)
-      .ilike('name', searchPattern)
-      .limit(10)
-
     if (files) {
       files.forEach((file) => {
         results.push({
@@ -151,16 +169,6 @@ export const GET = withAuth(async (request: NextRequest, { tenantId }) => {
       })
     }
 
-    // 6. Search Call Logs
-    const { data: callLogs } = await supabase
-      .from('call_logs')
-      .select('id, direction, duration, notes, created_at')
-      .eq('tenant_id', tenantId)
-      .or(
-        `notes.ilike.${searchPattern},from_number.ilike.${searchPattern},to_number.ilike.${searchPattern}`
-      )
-      .limit(10)
-
     if (callLogs) {
       callLogs.forEach((log) => {
         results.push({
@@ -35,7 +35,9 @@ export const GET = withAuth(async (request, { tenantId }) => {
     if (jobId) query = query.eq('job_id', jobId)
     if (rating) query = query.eq('rating', parseInt(rating))
     if (search) {
-      query = query.or(`feedback.ilike.%${search}%`)
+      // Escape SQL wildcards to prevent unexpected matches
+      const escapedSearch = search.replace(/[%_\\]/g, '\\$&')
+      query = query.or(`feedback.ilike.%${escapedSearch}%`)
     }
 
     query = query
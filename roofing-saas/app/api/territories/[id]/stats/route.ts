@@ -42,41 +42,56 @@ export const GET = withAuthParams(async (_request, { tenantId }, { params }) =>
     // In a production app, you'd typically store territory_id on contacts
     // or use PostGIS to query contacts within the territory boundary
 
-    // Count contacts (simplified - would need territory assignment field)
-    const { count: contactCount } = await supabase
-      .from('contacts')
-      .select('*', { count: 'exact', head: true })
-      .eq('tenant_id', tenantId)
-      .eq('is_deleted', false)
-
-    // Count projects (simplified)
-    const { count: projectCount } = await supabase
-      .from('projects')
-      .select('*', { count: 'exact', head: true })
-      .eq('tenant_id', tenantId)
-      .eq('is_deleted', false)
-
-    // Count photos (simplified)
-    const { count: photoCount } = await supabase
-      .from('project_files')
-      .select('*', { count: 'exact', head: true })
-      .eq('tenant_id', tenantId)
-      .eq('file_type', 'photo')
-      .eq('is_deleted', false)
-
-    // Count activities (simplified)
-    const { count: activityCount } = await supabase
-      .from('activities')
-      .select('*', { count: 'exact', head: true })
-      .eq('tenant_id', tenantId)
-      .eq('is_deleted', false)
-
-    // Get project pipeline stage breakdown
-    const { data: stageBreakdown } = await supabase
-      .from('projects')
-      .select('pipeline_stage')
-      .eq('tenant_id', tenantId)
-      .eq('is_deleted', false)
+    // The counts and breakdowns are independent of each other, so run them
+    // in parallel instead of paying one round trip each
+    const [
+      { count: contactCount },
+      { count: projectCount },
+      { count: photoCount },
+      { count: activityCount },
+      { data: stageBreakdown },
+      { data: recentActivities },
+    ] = await Promise.all([
+      // Count contacts (simplified - would need territory assignment field)
+      supabase
+        .from('contacts')
+        .select('*', { count: 'exact', head: true })
+        .eq('tenant_id', tenantId)
+        .eq('is_deleted', false),
+      // Count projects (simplified)
+      supabase
+        .from('projects')
+        .select('*', { count: 'exact', head: true })
+        .eq('tenant_id', tenantId)
+        .eq('is_deleted', false),
+      // Count photos (simplified)
+      supabase
+        .from('project_files')
+        .select('*', { count: 'exact', head: true })
+        .eq('tenant_id', tenantId)
+        .eq('file_type', 'photo')
+        .eq('is_deleted', false),
+      // Count activities (simplified)
+      supabase
+        .from('activities')
+        .select('*', { count: 'exact', head: true })
+        .eq('tenant_id', tenantId)
+        .eq('is_deleted', false),
+      // Get project pipeline stage breakdown
+      supabase
+        .from('projects')
+        .select('pipeline_stage')
+        .eq('tenant_id', tenantId)
+        .eq('is_deleted', false),
+      // Get recent activities (last 10)
+      supabase
+        .from('activities')
+        .select('id, type, content, created_at')
+        .eq('tenant_id', tenantId)
+        .eq('is_deleted', false)
+        .order('created_at', { ascending: false })
+        .limit(10),
+    ])
 
     const stageStats = stageBreakdown?.reduce((acc: Record<string, number>, project: Record<string, unknown>) => {
       const stage = (project.pipeline_stage as string) || 'unassigned'
@@ -87,15 +102,6 @@ export const GET = withAuthParams(async (_request, { tenantId }, { params }) =>
     // Get project pipeline stage breakdown (same as above for backwards compat)
     const projectStatusStats = stageStats
 
-    // Get recent activities (last 10)
-    const { data: recentActivities } = await supabase
-      .from('activities')
-      .select('id, type, content, created_at')
-      .eq('tenant_id', tenantId)
-      .eq('is_deleted', false)
-      .order('created_at', { ascending: false })
-      .limit(10)
-
     const duration = Date.now() - startTime
     logger.apiResponse('GET', `/api/territories/${territoryId}/stats`, 200, duration)
 
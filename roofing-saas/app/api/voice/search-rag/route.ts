@@ -6,7 +6,7 @@ import {
 import { successResponse, errorResponse } from '@/lib/api/response'
 import { logger } from '@/lib/logger'
 import { createClient } from '@/lib/supabase/server'
-import { generateEmbedding } from '@/lib/embeddings'
+import { generateEmbedding, serializeEmbedding } from '@/lib/embeddings'
 
 /**
  * Knowledge base search result from vector similarity search
@@ -58,12 +58,16 @@ export const POST = withAuth(async (request, { userId, tenantId }) => {
       return successResponse(fallbackResult)
     }
 
+    // Serialize the 1536-float vector once; it's sent to both the search RPC
+    // and the analytics insert
+    const queryVector = serializeEmbedding(embeddingResult.embedding)
+
     // Search knowledge base
     const supabase = await createClient()
     const { data: results, error: searchError } = await supabase.rpc(
       'search_roofing_knowledge',
       {
-        query_embedding: JSON.stringify(embeddingResult.embedding),
+        query_embedding: queryVector,
         match_threshold: threshold,
         match_count: limit,
         filter_category: null,
@@ -111,7 +115,7 @@ export const POST = withAuth(async (request, { userId, tenantId }) => {
       tenant_id: tenantId,
       user_id: userId,
       query_text: query,
-      query_embedding: JSON.stringify(embeddingResult.embedding),
+      query_embedding: queryVector,
       results_count: formattedResults.length,
       top_result_id: null,
       relevance_score: formattedResults.length > 0 ? formattedResults[0].relevance : null,
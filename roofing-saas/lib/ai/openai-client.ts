@@ -187,6 +187,9 @@ export async function createStreamingChatCompletion(
 export function createOpenAIClient(): OpenAI {
   return new OpenAI({
     apiKey: process.env.OPENAI_API_KEY,
+    // SDK-level retry covers calls that don't go through the chat-completion
+    // wrappers above (embeddings, audio, etc.)
+    maxRetries: MAX_RETRIES,
   })
 }
 
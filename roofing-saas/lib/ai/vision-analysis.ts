@@ -6,7 +6,7 @@
  */
 
 import OpenAI from 'openai'
-import { createOpenAIClient } from './openai-client'
+import { getOpenAIClient } from './openai-client'
 import { logger } from '@/lib/logger'
 import type {
   DamageCause,
@@ -178,7 +178,7 @@ export async function analyzeRoofPhoto(
   imageUrl: string,
   additionalContext?: string
 ): Promise<PhotoAnalysisResult> {
-  const openai = createOpenAIClient()
+  const openai = getOpenAIClient()
 
   try {
     const prompt = additionalContext
@@ -258,7 +258,7 @@ export async function compareBeforeAfter(
   afterUrl: string,
   workDescription?: string
 ): Promise<BeforeAfterComparison> {
-  const openai = createOpenAIClient()
+  const openai = getOpenAIClient()
 
   try {
     const prompt = workDescription
@@ -336,7 +336,7 @@ export async function estimateFromPhoto(
     knownSquareFootage?: number
   }
 ): Promise<PhotoEstimate> {
-  const openai = createOpenAIClient()
+  const openai = getOpenAIClient()
 
   try {
     let contextInfo = ''
@@ -421,7 +421,7 @@ export async function analyzePhotoSet(
     inspectionReason?: string
   }
 ): Promise<PhotoAnalysisResult> {
-  const openai = createOpenAIClient()
+  const openai = getOpenAIClient()
 
   if (imageUrls.length === 0) {
     return {
@@ -7,7 +7,7 @@ import { ariaFunctionRegistry } from '../function-registry'
 import { canSendSMS } from '@/lib/twilio/compliance'
 import { canSendEmail } from '@/lib/resend/compliance'
 import { logger } from '@/lib/logger'
-import { translateResponse, updateContactLanguage } from '../language'
+import { LANGUAGE_NAMES, translateResponse, updateContactLanguage } from '../language'
 import type { SupportedLanguage } from '../types'
 
 // =============================================================================
@@ -496,15 +496,9 @@ ariaFunctionRegistry.register({
         language as SupportedLanguage
       )
 
-      const languageNames: Record<string, string> = {
-        en: 'English',
-        es: 'Spanish',
-        fr: 'French',
-      }
-
       return {
         success: true,
-        message: `Language preference set to ${languageNames[language]} for this contact.`,
+        message: `Language preference set to ${LANGUAGE_NAMES[language as SupportedLanguage]} for this contact.`,
       }
     } catch (error) {
       logger.error('ARIA set_contact_language error:', { error })
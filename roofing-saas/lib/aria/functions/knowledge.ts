@@ -4,7 +4,7 @@
  */
 
 import { ariaFunctionRegistry } from '../function-registry'
-import { generateEmbedding } from '@/lib/embeddings'
+import { generateEmbedding, serializeEmbedding } from '@/lib/embeddings'
 import { logger } from '@/lib/logger'
 
 // =============================================================================
@@ -63,7 +63,7 @@ ariaFunctionRegistry.register({
       const { data: results, error: searchError } = await context.supabase.rpc(
         'search_roofing_knowledge',
         {
-          query_embedding: JSON.stringify(embeddingResult.embedding),
+          query_embedding: serializeEmbedding(embeddingResult.embedding),
           match_threshold: 0.65,
           match_count: limit,
           filter_category: category || null,
@@ -129,6 +129,19 @@ ariaFunctionRegistry.register({
 // Ask Roofing Question
 // =============================================================================
 
+// Topic -> knowledge category dispatch table, built once at module load
+// instead of on every call
+const TOPIC_CATEGORY_MAP: Record<string, string> = {
+  pricing: 'pricing',
+  materials: 'materials',
+  timeline: 'procedures',
+  warranty: 'general',
+  insurance: 'insurance',
+  repair_vs_replace: 'procedures',
+  weather: 'weather',
+  maintenance: 'procedures',
+}
+
 ariaFunctionRegistry.register({
   name: 'ask_roofing_question',
   category: 'knowledge',
@@ -173,24 +186,13 @@ ariaFunctionRegistry.register({
       }
 
       // Map topic to category
-      const categoryMap: Record<string, string> = {
-        pricing: 'pricing',
-        materials: 'materials',
-        timeline: 'procedures',
-        warranty: 'general',
-        insurance: 'insurance',
-        repair_vs_replace: 'procedures',
-        weather: 'weather',
-        maintenance: 'procedures',
-      }
-
-      const filterCategory = topic ? categoryMap[topic] || null : null
+      const filterCategory = topic ? TOPIC_CATEGORY_MAP[topic] || null : null
 
       // Search for best matching answer
       const { data: results, error: searchError } = await context.supabase.rpc(
         'search_roofing_knowledge',
         {
-          query_embedding: JSON.stringify(embeddingResult.embedding),
+          query_embedding: serializeEmbedding(embeddingResult.embedding),
           match_threshold: 0.70, // Higher threshold for Q&A
           match_count: 1,
           filter_category: filterCategory,
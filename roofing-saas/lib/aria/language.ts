@@ -18,6 +18,13 @@ import { logger } from '@/lib/logger'
 // Language Detection
 // =============================================================================
 
+/** English display names for the supported languages, built once at module load */
+export const LANGUAGE_NAMES: Record<SupportedLanguage, string> = {
+  en: 'English',
+  es: 'Spanish',
+  fr: 'French',
+}
+
 export interface LanguageDetectionResult {
   language: SupportedLanguage
   confidence: number
@@ -111,20 +118,14 @@ export async function translateResponse(
   if (targetLanguage === 'en') return text
   if (!text.trim()) return text
 
-  const languageNames: Record<SupportedLanguage, string> = {
-    en: 'English',
-    es: 'Spanish',
-    fr: 'French',
-  }
-
-  const systemPrompt = `You are a professional translator for a roofing business. Translate the following text from English to ${languageNames[targetLanguage]}.
+  const systemPrompt = `You are a professional translator for a roofing business. Translate the following text from English to ${LANGUAGE_NAMES[targetLanguage]}.
 
 Rules:
 - Maintain the same tone (warm, professional, helpful)
 - Keep any proper nouns unchanged (company names, person names, addresses)
 - Keep phone numbers, dates, and dollar amounts in their original format
 - Do not add or remove information
-- If the text contains technical roofing terms, use the appropriate ${languageNames[targetLanguage]} equivalent
+- If the text contains technical roofing terms, use the appropriate ${LANGUAGE_NAMES[targetLanguage]} equivalent
 ${context ? `\nContext: ${context}` : ''}
 
 Return ONLY the translated text, nothing else.`
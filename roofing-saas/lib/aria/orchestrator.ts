@@ -9,6 +9,19 @@ import type { ARIAContext, ARIAExecutionResult, ARIAOrchestrator } from './types
 import { ariaFunctionRegistry } from './function-registry'
 import { buildARIAContext, getContextSummary } from './context-builder'
 import { getLocalizedSystemPrompt } from './system-prompts'
+import { LANGUAGE_NAMES } from './language'
+import type { SupportedLanguage } from './types'
+
+// The respond-in-this-language directive is constant per language, so render
+// it once at module load instead of re-formatting it on every prompt build
+const LANGUAGE_DIRECTIVES = Object.fromEntries(
+  Object.entries(LANGUAGE_NAMES)
+    .filter(([code]) => code !== 'en')
+    .map(([code, name]) => [
+      code,
+      `\n\nIMPORTANT: You MUST respond in ${name}. All responses to the customer must be in ${name}.`,
+    ])
+) as Partial<Record<SupportedLanguage, string>>
 
 /**
  * ARIA Orchestrator Implementation
@@ -98,12 +111,9 @@ class Orchestrator implements ARIAOrchestrator {
     }
 
     // For non-English: instruct the model to respond in the target language
-    if (language !== 'en') {
-      const languageNames: Record<string, string> = {
-        es: 'Spanish',
-        fr: 'French',
-      }
-      prompt += `\n\nIMPORTANT: You MUST respond in ${languageNames[language] || language}. All responses to the customer must be in ${languageNames[language] || language}.`
+    const directive = LANGUAGE_DIRECTIVES[language]
+    if (directive) {
+      prompt += directive
     }
 
     return prompt
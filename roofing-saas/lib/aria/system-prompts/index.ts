@@ -72,6 +72,11 @@ const PROMPTS: Record<SupportedLanguage, PromptSet> = {
   },
 }
 
+// Every part above is a static constant, so the assembled prompt for a given
+// (language, channel) pair never changes — build it once and reuse it instead
+// of re-concatenating several KB of prompt text on every request
+const assembledPrompts = new Map<string, string>()
+
 /**
  * Get the localized system prompt for ARIA, assembled from pre-translated parts.
  * Context summary (internal data labels) stays English — the LLM handles mixed-language fine.
@@ -80,6 +85,12 @@ export function getLocalizedSystemPrompt(
   language: SupportedLanguage,
   channel: ARIAContext['channel']
 ): string {
+  const cacheKey = `${language}:${channel}`
+  const cached = assembledPrompts.get(cacheKey)
+  if (cached) {
+    return cached
+  }
+
   const promptSet = PROMPTS[language] || PROMPTS.en
 
   let prompt = promptSet.base
@@ -103,5 +114,6 @@ export function getLocalizedSystemPrompt(
     prompt += `\n\n${promptSet.uiSelfAwareness}`
   }
 
+  assembledPrompts.set(cacheKey, prompt)
   return prompt
 }
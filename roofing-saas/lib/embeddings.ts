@@ -6,14 +6,116 @@
 import { logger } from '@/lib/logger'
 
 const OPENAI_API_KEY = process.env.OPENAI_API_KEY
-const EMBEDDING_MODEL = 'text-embedding-3-small' // 1536 dimensions, $0.02 per 1M tokens
+const EMBEDDING_MODEL = 'text-embedding-3-small' // $0.02 per 1M tokens
+// text-embedding-3-* models accept a `dimensions` parameter (MRL truncation).
+// Must match the vector(N) columns in Postgres - changing this requires a
+// column migration plus a full re-embed, but buys O(dimensions) savings in
+// storage, index memory, and distance cost if recall holds up.
+const EMBEDDING_DIMENSIONS = 1536
+// Per-input limit for text-embedding-3-* is 8192 tokens; inputs are clipped
+// slightly below that since estimateTokenCount is approximate
+const MAX_INPUT_TOKENS = 8000
 const MAX_BATCH_SIZE = 100 // OpenAI limit
+const MAX_CONCURRENT_BATCHES = 8 // In-flight requests for multi-batch workloads
+const BATCH_TOKEN_BUDGET = 200_000 // Stay under the ~300k tokens-per-request ceiling
 
 export interface EmbeddingResult {
   embedding: number[]
   tokens: number
 }
 
+// Repeated inputs (common for search queries) hit this in-process cache
+// instead of paying another API round trip. Simple LRU via Map insertion
+// order; cache hits report 0 tokens so usage tracking only counts API calls.
+const EMBEDDING_CACHE_MAX_ENTRIES = 1000
+const embeddingCache = new Map<string, number[]>()
+
+// Queries like "GAF warranty" and " gaf  warranty " produce near-identical
+// embeddings; normalize the cache key so whitespace and casing variants of
+// the same query share one cache entry. The text sent to the API is untouched.
+function cacheKey(text: string): string {
+  return text.trim().replace(/\s+/g, ' ').toLowerCase()
+}
+
+function cacheGet(text: string): number[] | undefined {
+  const key = cacheKey(text)
+  const cached = embeddingCache.get(key)
+  if (cached) {
+    // Refresh recency
+    embeddingCache.delete(key)
+    embeddingCache.set(key, cached)
+  }
+  return cached
+}
+
+function cacheSet(text: string, embedding: number[]): void {
+  if (embeddingCache.size >= EMBEDDING_CACHE_MAX_ENTRIES) {
+    const oldest = embeddingCache.keys().next().value
+    if (oldest !== undefined) embeddingCache.delete(oldest)
+  }
+  embeddingCache.set(cacheKey(text), embedding)
+}
+
+const MAX_FETCH_ATTEMPTS = 3
+
+/**
+ * POST to the embeddings endpoint, retrying transient failures (429/5xx)
+ * with exponential backoff and honoring Retry-After when present. Without
+ * this, a momentary rate-limit blip fails the whole call.
+ */
+async function fetchEmbeddings(body: Record<string, unknown>): Promise<Response> {
+  for (let attempt = 0; ; attempt++) {
+    const response = await fetch('https://api.openai.com/v1/embeddings', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Authorization': `Bearer ${OPENAI_API_KEY}`,
+      },
+      body: JSON.stringify(body),
+    })
+
+    const transient = response.status === 429 || response.status >= 500
+    if (transient && attempt < MAX_FETCH_ATTEMPTS) {
+      const retryAfter = Number(response.headers.get('retry-after')) || 2 ** attempt
+      const waitMs = retryAfter * 1000 + Math.random() * 250
+      logger.warn('OpenAI embedding API transient error, retrying', {
+        status: response.status,
+        attempt: attempt + 1,
+        waitMs: Math.round(waitMs),
+      })
+      await new Promise(resolve => setTimeout(resolve, waitMs))
+      continue
+    }
+
+    return response
+  }
+}
+
+/**
+ * Decode a base64-encoded float32 embedding. Requesting base64 instead of
+ * JSON float arrays cuts the response body ~3x (8KB vs 25KB per vector) and
+ * replaces 1536 JSON number parses with one buffer decode.
+ */
+function decodeEmbedding(data: string): number[] {
+  const buf = Buffer.from(data, 'base64')
+  return Array.from(new Float32Array(buf.buffer, buf.byteOffset, buf.byteLength / 4))
+}
+
+/**
+ * Truncate text to the embedding model's input window, measured in
+ * (estimated) tokens rather than characters
+ */
+function clampToTokenLimit(text: string): string {
+  if (estimateTokenCount(text) <= MAX_INPUT_TOKENS) {
+    return text
+  }
+  // Cut at the last whitespace inside the window so the final token is a
+  // whole word rather than an arbitrary character fragment
+  const truncated = text.slice(0, MAX_INPUT_TOKENS * 4)
+  const lastSpace = truncated.lastIndexOf(' ')
+  return lastSpace > truncated.length / 2 ? truncated.slice(0, lastSpace) : truncated
+}
+
 /**
  * Generate embedding for a single text
  */
@@ -23,18 +125,19 @@ export async function generateEmbedding(text: string): Promise<EmbeddingResult |
     return null
   }
 
+  text = clampToTokenLimit(text)
+
+  const cached = cacheGet(text)
+  if (cached) {
+    return { embedding: cached, tokens: 0 }
+  }
+
   try {
-    const response = await fetch('https://api.openai.com/v1/embeddings', {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        'Authorization': `Bearer ${OPENAI_API_KEY}`,
-      },
-      body: JSON.stringify({
-        model: EMBEDDING_MODEL,
-        input: text,
-        encoding_format: 'float', // Standard float array
-      }),
+    const response = await fetchEmbeddings({
+      model: EMBEDDING_MODEL,
+      input: text,
+      dimensions: EMBEDDING_DIMENSIONS,
+      encoding_format: 'base64',
     })
 
     if (!response.ok) {
@@ -44,9 +147,12 @@ export async function generateEmbedding(text: string): Promise<EmbeddingResult |
     }
 
     const data = await response.json()
+    const embedding = decodeEmbedding(data.data[0].embedding)
+
+    cacheSet(text, embedding)
 
     return {
-      embedding: data.data[0].embedding,
+      embedding,
       tokens: data.usage.total_tokens,
     }
   } catch (error) {
@@ -71,46 +177,106 @@ export async function generateEmbeddings(
     return { embeddings: [], totalTokens: 0 }
   }
 
+  texts = texts.map(clampToTokenLimit)
+
   try {
-    const allEmbeddings: number[][] = []
-    let totalTokens = 0
+    // Identical inputs are embedded once and fanned back out to every
+    // position that asked for them - duplicates cost tokens for no new
+    // information
+    const firstIndexOf = new Map<string, number>()
+    const duplicates: number[] = []
+    const uniqueIndices: number[] = []
+    for (let i = 0; i < texts.length; i++) {
+      if (firstIndexOf.has(texts[i])) {
+        duplicates.push(i)
+      } else {
+        firstIndexOf.set(texts[i], i)
+        uniqueIndices.push(i)
+      }
+    }
 
-    // Process in batches
-    for (let i = 0; i < texts.length; i += MAX_BATCH_SIZE) {
-      const batch = texts.slice(i, i + MAX_BATCH_SIZE)
-
-      const response = await fetch('https://api.openai.com/v1/embeddings', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-          'Authorization': `Bearer ${OPENAI_API_KEY}`,
-        },
-        body: JSON.stringify({
-          model: EMBEDDING_MODEL,
-          input: batch,
-          encoding_format: 'float',
-        }),
-      })
+    // Sort inputs by length, then greedily pack batches up to both the input
+    // count limit and a token budget. Length-sorted packing keeps batches
+    // uniform so one long outlier doesn't force a tiny batch, and the token
+    // budget avoids oversized-request rejections that count-only batching
+    // can hit. Original positions are tracked so results come back in order.
+    const order = [...uniqueIndices].sort((a, b) => texts[a].length - texts[b].length)
 
-      if (!response.ok) {
-        const error = await response.text()
-        logger.error('OpenAI batch embedding API error', { status: response.status, error })
-        return null
+    const batches: number[][] = []
+    let currentBatch: number[] = []
+    let currentTokens = 0
+    for (const index of order) {
+      const tokens = estimateTokenCount(texts[index])
+      if (
+        currentBatch.length > 0 &&
+        (currentBatch.length >= MAX_BATCH_SIZE || currentTokens + tokens > BATCH_TOKEN_BUDGET)
+      ) {
+        batches.push(currentBatch)
+        currentBatch = []
+        currentTokens = 0
       }
+      currentBatch.push(index)
+      currentTokens += tokens
+    }
+    if (currentBatch.length > 0) {
+      batches.push(currentBatch)
+    }
+
+    const batchResults: { embeddings: number[][]; tokens: number }[] = new Array(batches.length)
 
-      const data = await response.json()
+    // Run batches concurrently with a bounded number in flight - the workload
+    // is network-bound, so overlapping round-trips gives near-linear speedup
+    let nextBatch = 0
+    const worker = async (): Promise<boolean> => {
+      while (true) {
+        const batchIndex = nextBatch++
+        if (batchIndex >= batches.length) return true
 
-      // Collect embeddings in order
-      for (const item of data.data) {
-        allEmbeddings.push(item.embedding)
+        const response = await fetchEmbeddings({
+          model: EMBEDDING_MODEL,
+          input: batches[batchIndex].map(textIndex => texts[textIndex]),
+          dimensions: EMBEDDING_DIMENSIONS,
+          encoding_format: 'base64',
+        })
+
+        if (!response.ok) {
+          const error = await response.text()
+          logger.error('OpenAI batch embedding API error', { status: response.status, error })
+          return false
+        }
+
+        const data = await response.json()
+
+        // Collect embeddings in batch order
+        const embeddings: number[][] = new Array(batches[batchIndex].length)
+        for (const item of data.data) {
+          embeddings[item.index] = decodeEmbedding(item.embedding)
+        }
+
+        batchResults[batchIndex] = { embeddings, tokens: data.usage.total_tokens }
       }
+    }
+
+    const workerCount = Math.min(MAX_CONCURRENT_BATCHES, batches.length)
+    const outcomes = await Promise.all(Array.from({ length: workerCount }, () => worker()))
 
-      totalTokens += data.usage.total_tokens
+    if (outcomes.includes(false)) {
+      return null
+    }
 
-      // Rate limiting: small delay between batches
-      if (i + MAX_BATCH_SIZE < texts.length) {
-        await new Promise(resolve => setTimeout(resolve, 100))
+    // Scatter batch results back to the callers' input order
+    const allEmbeddings: number[][] = new Array(texts.length)
+    let totalTokens = 0
+    for (let b = 0; b < batches.length; b++) {
+      const result = batchResults[b]
+      for (let i = 0; i < batches[b].length; i++) {
+        allEmbeddings[batches[b][i]] = result.embeddings[i]
       }
+      totalTokens += result.tokens
+    }
+
+    for (const i of duplicates) {
+      allEmbeddings[i] = allEmbeddings[firstIndexOf.get(texts[i])!]
     }
 
     return { embeddings: allEmbeddings, totalTokens }
@@ -135,6 +301,21 @@ export async function generateKnowledgeEmbedding(
   return generateEmbedding(text)
 }
 
+/**
+ * Serialize an embedding to pgvector's text format
+ * Floats are written at single precision (7 significant digits) - pgvector
+ * stores float32 lanes anyway, and this roughly halves the payload compared
+ * to JSON.stringify's full double-precision output
+ */
+export function serializeEmbedding(embedding: number[]): string {
+  let result = '['
+  for (let i = 0; i < embedding.length; i++) {
+    if (i > 0) result += ','
+    result += embedding[i].toPrecision(7)
+  }
+  return result + ']'
+}
+
 /**
  * Calculate cosine similarity between two embeddings
  * Returns value between -1 and 1 (1 = identical, 0 = orthogonal, -1 = opposite)
@@ -104,15 +104,28 @@ async function main() {
 
         console.log(`  Deleting: ${recordToDelete.type} ${recordToDelete.hostname} (${recordToDelete.id})`)
 
-        const deleteResponse = await fetch(
-          `https://api.netlify.com/api/v1/dns_zones/${zone.id}/dns_records/${recordToDelete.id}`,
-          {
-            method: 'DELETE',
-            headers: {
-              Authorization: `Bearer ${NETLIFY_API_TOKEN}`,
-            },
+        // Back off only when Netlify actually rate limits (429), honoring
+        // Retry-After, instead of paying a fixed delay on every delete
+        let deleteResponse: Response
+        for (let attempt = 0; ; attempt++) {
+          deleteResponse = await fetch(
+            `https://api.netlify.com/api/v1/dns_zones/${zone.id}/dns_records/${recordToDelete.id}`,
+            {
+              method: 'DELETE',
+              headers: {
+                Authorization: `Bearer ${NETLIFY_API_TOKEN}`,
+              },
+            }
+          )
+
+          if (deleteResponse.status === 429 && attempt < 3) {
+            const retryAfter = Number(deleteResponse.headers.get('retry-after')) || 2 ** attempt
+            console.log(`  Rate limited, retrying in ${retryAfter}s...`)
+            await new Promise(resolve => setTimeout(resolve, retryAfter * 1000))
+            continue
           }
-        )
+          break
+        }
 
         if (!deleteResponse.ok) {
           console.log(`  ❌ Failed: ${deleteResponse.statusText}`)
@@ -120,9 +133,6 @@ async function main() {
           console.log(`  ✅ Deleted`)
           deletedCount++
         }
-
-        // Rate limiting: wait 100ms between deletes
-        await new Promise(resolve => setTimeout(resolve, 100))
       }
     }
   }
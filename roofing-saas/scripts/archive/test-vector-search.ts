@@ -29,29 +29,21 @@ const supabase = createClient(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
 const openai = new OpenAI({ apiKey: OPENAI_API_KEY })
 
 /**
- * Generate embedding using OpenAI
+ * Generate embeddings for all queries in a single OpenAI call
  */
-async function generateEmbedding(text: string): Promise<number[]> {
+async function generateEmbeddings(texts: string[]): Promise<number[][]> {
   const response = await openai.embeddings.create({
     model: 'text-embedding-3-small',
-    input: text,
+    input: texts,
     dimensions: 1536,
   })
-  return response.data[0].embedding
+  return response.data.map((item) => item.embedding)
 }
 
 /**
  * Search knowledge base using vector similarity
  */
-async function searchKnowledgeBase(query: string, matchCount: number = 5) {
-  console.log(`\n🔍 Query: "${query}"`)
-  console.log('=' .repeat(80))
-
-  // Generate query embedding
-  console.log('   Generating query embedding...')
-  const queryEmbedding = await generateEmbedding(query)
-
-  // Search using pgvector cosine similarity
+async function searchKnowledgeBase(queryEmbedding: number[], matchCount: number = 5) {
   const { data, error } = await supabase.rpc('match_documents', {
     query_embedding: queryEmbedding,
     match_count: matchCount,
@@ -62,16 +54,6 @@ async function searchKnowledgeBase(query: string, matchCount: number = 5) {
     return []
   }
 
-  // Display results
-  console.log(`\n📊 Found ${data.length} results:\n`)
-
-  data.forEach((result: any, index: number) => {
-    console.log(`${index + 1}. ${result.title} (Similarity: ${(result.similarity * 100).toFixed(1)}%)`)
-    console.log(`   Type: ${result.source_type}`)
-    console.log(`   Content preview: ${result.content.substring(0, 150)}...`)
-    console.log()
-  })
-
   return data
 }
 
@@ -91,10 +73,29 @@ async function runTests() {
     'recent leads from sales pipeline',
   ]
 
-  for (const query of testQueries) {
-    await searchKnowledgeBase(query, 3)
-    await new Promise(resolve => setTimeout(resolve, 500)) // Rate limiting
-  }
+  // The query set is fixed, so embed it in one API call and run the
+  // searches concurrently instead of paying 5 sequential round trips
+  console.log('\n   Generating query embeddings...')
+  const embeddings = await generateEmbeddings(testQueries)
+
+  const resultSets = await Promise.all(
+    embeddings.map((embedding) => searchKnowledgeBase(embedding, 3))
+  )
+
+  testQueries.forEach((query, queryIndex) => {
+    console.log(`\n🔍 Query: "${query}"`)
+    console.log('=' .repeat(80))
+
+    const data = resultSets[queryIndex]
+    console.log(`\n📊 Found ${data.length} results:\n`)
+
+    data.forEach((result: any, index: number) => {
+      console.log(`${index + 1}. ${result.title} (Similarity: ${(result.similarity * 100).toFixed(1)}%)`)
+      console.log(`   Type: ${result.source_type}`)
+      console.log(`   Content preview: ${result.content.substring(0, 150)}...`)
+      console.log()
+    })
+  })
 
   console.log('=' .repeat(80))
   console.log('\n✨ Vector search test complete!')
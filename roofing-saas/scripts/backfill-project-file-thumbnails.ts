@@ -27,6 +27,10 @@ if (!SUPABASE_URL || !SUPABASE_SERVICE_KEY) {
 
 const supabase = createClient(SUPABASE_URL, SUPABASE_SERVICE_KEY)
 
+// Files processed in parallel - kept modest so sharp's CPU work and the
+// storage API both stay comfortable
+const CONCURRENCY = 4
+
 interface FileRecord {
   id: string
   file_url: string
@@ -62,12 +66,25 @@ async function generateThumbnail(imageBuffer: Buffer): Promise<Buffer> {
 }
 
 async function downloadImage(url: string): Promise<Buffer> {
-  const response = await fetch(url)
-  if (!response.ok) {
-    throw new Error(`Failed to download: ${response.status} ${response.statusText}`)
+  // Back off only when the server actually rate limits (429), honoring
+  // Retry-After, instead of paying a fixed delay on every file
+  for (let attempt = 0; ; attempt++) {
+    const response = await fetch(url)
+
+    if (response.status === 429 && attempt < 3) {
+      const retryAfter = Number(response.headers.get('retry-after')) || 2 ** attempt
+      const waitMs = retryAfter * 1000 + Math.random() * 250
+      console.log(`  Rate limited, retrying in ${Math.ceil(waitMs / 1000)}s...`)
+      await new Promise((resolve) => setTimeout(resolve, waitMs))
+      continue
+    }
+
+    if (!response.ok) {
+      throw new Error(`Failed to download: ${response.status} ${response.statusText}`)
+    }
+    const arrayBuffer = await response.arrayBuffer()
+    return Buffer.from(arrayBuffer)
   }
-  const arrayBuffer = await response.arrayBuffer()
-  return Buffer.from(arrayBuffer)
 }
 
 function extractStorageFileName(fileUrl: string): string | null {
@@ -184,18 +201,23 @@ async function main() {
   console.log(`Found ${files.length} files to process`)
   console.log('')
 
-  for (let i = 0; i < files.length; i++) {
-    const file = files[i]
-    console.log(`[${i + 1}/${files.length}] ${file.file_name}`)
-    stats.processed++
-
-    await processFile(file, dryRun)
-
-    // Rate limit
-    if (!dryRun && i < files.length - 1) {
-      await new Promise((resolve) => setTimeout(resolve, 100))
+  // Each file is download -> resize -> upload -> update, dominated by
+  // network waits, so overlap a bounded number of files instead of
+  // processing one at a time
+  let nextFile = 0
+  const worker = async () => {
+    while (nextFile < files.length) {
+      const i = nextFile++
+      const file = files[i]
+      console.log(`[${i + 1}/${files.length}] ${file.file_name}`)
+      stats.processed++
+
+      await processFile(file, dryRun)
     }
   }
+  await Promise.all(
+    Array.from({ length: Math.min(CONCURRENCY, files.length) }, () => worker())
+  )
 
   console.log('')
   console.log('='.repeat(60))
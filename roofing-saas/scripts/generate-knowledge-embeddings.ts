@@ -11,6 +11,12 @@
 import { createClient } from '@supabase/supabase-js'
 import * as dotenv from 'dotenv'
 import * as path from 'path'
+import {
+  generateEmbeddingsBatch,
+  clampToTokenLimit,
+  calculateEmbeddingCost,
+  serializeEmbedding,
+} from './lib/embeddings'
 
 // Load .env.local file
 dotenv.config({ path: path.resolve(process.cwd(), '.env.local') })
@@ -19,61 +25,38 @@ const OPENAI_API_KEY = process.env.OPENAI_API_KEY
 const SUPABASE_URL = process.env.NEXT_PUBLIC_SUPABASE_URL!
 const SUPABASE_SERVICE_ROLE_KEY = process.env.SUPABASE_SERVICE_ROLE_KEY!
 
-const EMBEDDING_MODEL = 'text-embedding-3-small'
+const BATCH_SIZE = 100 // OpenAI accepts arrays of inputs per request
+const PAGE_SIZE = 500 // Rows fetched from Postgres per page (bounds memory)
+const MAX_CONCURRENT_BATCHES = 4 // Batches in flight - the work is network-bound
 
-interface EmbeddingResult {
-  embedding: number[]
-  tokens: number
+function knowledgeEmbeddingInput(title: string, content: string): string {
+  return clampToTokenLimit(`${title}\n\n${content}`)
 }
 
-async function generateEmbedding(text: string): Promise<EmbeddingResult | null> {
-  if (!OPENAI_API_KEY) {
-    console.error('❌ OPENAI_API_KEY not configured')
-    return null
+// Token-bucket rate limiting: sleep only when the next batch would push us
+// over the per-minute token budget, instead of a fixed delay per batch
+const TOKENS_PER_MINUTE = 1_000_000 // OpenAI tier-1 embedding TPM
+
+let rateWindowStart = Date.now()
+let rateWindowTokens = 0
+
+async function throttleForTokens(estimatedTokens: number): Promise<void> {
+  const elapsed = Date.now() - rateWindowStart
+  if (elapsed >= 60_000) {
+    rateWindowStart = Date.now()
+    rateWindowTokens = 0
+  } else if (rateWindowTokens + estimatedTokens > TOKENS_PER_MINUTE) {
+    const waitMs = 60_000 - elapsed
+    console.log(`   ⏳ Approaching token rate limit, waiting ${Math.ceil(waitMs / 1000)}s...`)
+    await new Promise(resolve => setTimeout(resolve, waitMs))
+    rateWindowStart = Date.now()
+    rateWindowTokens = 0
   }
-
-  try {
-    const response = await fetch('https://api.openai.com/v1/embeddings', {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        'Authorization': `Bearer ${OPENAI_API_KEY}`,
-      },
-      body: JSON.stringify({
-        model: EMBEDDING_MODEL,
-        input: text,
-        encoding_format: 'float',
-      }),
-    })
-
-    if (!response.ok) {
-      const error = await response.text()
-      console.error('OpenAI API error:', response.status, error)
-      return null
-    }
-
-    const data = await response.json()
-
-    return {
-      embedding: data.data[0].embedding,
-      tokens: data.usage.total_tokens,
-    }
-  } catch (error) {
-    console.error('Failed to generate embedding:', error)
-    return null
-  }
-}
-
-async function generateKnowledgeEmbedding(
-  title: string,
-  content: string
-): Promise<EmbeddingResult | null> {
-  const text = `${title}\n\n${content}`
-  return generateEmbedding(text)
+  rateWindowTokens += estimatedTokens
 }
 
-function calculateEmbeddingCost(tokens: number): number {
-  return (tokens / 1_000_000) * 0.02
+function recordActualTokens(estimatedTokens: number, actualTokens: number): void {
+  rateWindowTokens += actualTokens - estimatedTokens
 }
 
 async function main() {
@@ -98,69 +81,115 @@ async function main() {
     }
   })
 
-  // Get all knowledge entries without embeddings
-  const { data: knowledge, error: fetchError } = await supabase
-    .from('roofing_knowledge')
-    .select('id, title, content, category')
-    .is('embedding', null)
-    .eq('is_active', true)
-
-  if (fetchError) {
-    console.error('❌ Failed to fetch knowledge entries:', fetchError)
-    process.exit(1)
-  }
-
-  if (!knowledge || knowledge.length === 0) {
-    console.log('✅ All knowledge entries already have embeddings')
-    process.exit(0)
-  }
-
-  console.log(`📝 Found ${knowledge.length} entries without embeddings\n`)
-
   // Generate embeddings
   let totalTokens = 0
   let successCount = 0
+  let totalSeen = 0
   const errors: string[] = []
 
-  for (let i = 0; i < knowledge.length; i++) {
-    const entry = knowledge[i]
-    const progress = `[${i + 1}/${knowledge.length}]`
+  // Stream entries in bounded pages rather than loading the whole backlog
+  // into memory (PostgREST also silently caps unbounded selects at 1000 rows).
+  // Successfully embedded rows drop out of the `embedding IS NULL` filter,
+  // so re-fetching the first page walks through the backlog.
+  while (true) {
+    const { data: knowledge, error: fetchError } = await supabase
+      .from('roofing_knowledge')
+      .select('id, title, content, category')
+      .is('embedding', null)
+      .eq('is_active', true)
+      .order('id', { ascending: true })
+      .limit(PAGE_SIZE)
+
+    if (fetchError) {
+      console.error('❌ Failed to fetch knowledge entries:', fetchError)
+      process.exit(1)
+    }
 
-    try {
-      console.log(`${progress} Processing: ${entry.title}`)
+    if (!knowledge || knowledge.length === 0) {
+      if (totalSeen === 0) {
+        console.log('✅ All knowledge entries already have embeddings')
+        process.exit(0)
+      }
+      break
+    }
+
+    console.log(`📝 Processing page of ${knowledge.length} entries without embeddings\n`)
+    totalSeen += knowledge.length
+    const pageStartSuccess = successCount
+
+    // Split the page into batches and run them with a bounded number in
+    // flight - each batch is an independent API call + RPC, so overlapping
+    // their round trips cuts page latency by roughly the concurrency factor.
+    // The token-bucket throttle is shared, so aggregate throughput still
+    // respects the per-minute budget.
+    const batches: typeof knowledge[] = []
+    for (let batchStart = 0; batchStart < knowledge.length; batchStart += BATCH_SIZE) {
+      batches.push(knowledge.slice(batchStart, batchStart + BATCH_SIZE))
+    }
+
+    let nextBatch = 0
+    const worker = async () => {
+      while (true) {
+        const batchIndex = nextBatch++
+        if (batchIndex >= batches.length) return
+        await processBatch(batches[batchIndex], `[batch ${batchIndex + 1}/${batches.length}]`)
+      }
+    }
+
+    const processBatch = async (batch: typeof knowledge, progress: string) => {
+      try {
+        console.log(`${progress} Embedding batch of ${batch.length} entries...`)
 
-      const result = await generateKnowledgeEmbedding(entry.title, entry.content)
+        const inputs = batch.map(entry => knowledgeEmbeddingInput(entry.title, entry.content))
 
-      if (result) {
-        // Update knowledge entry with embedding
-        const { error: updateError } = await supabase
-          .from('roofing_knowledge')
-          .update({ embedding: JSON.stringify(result.embedding) })
-          .eq('id', entry.id)
+        // ~4 characters per token for English text
+        const estimatedTokens = Math.ceil(inputs.reduce((sum, text) => sum + text.length, 0) / 4)
+        await throttleForTokens(estimatedTokens)
+
+        const result = await generateEmbeddingsBatch(inputs)
+
+        totalTokens += result.tokens
+        recordActualTokens(estimatedTokens, result.tokens)
+
+        // Single set-based UPDATE for the whole batch instead of one round trip per row
+        const { data: updatedCount, error: updateError } = await supabase.rpc(
+          'update_knowledge_embeddings',
+          {
+            updates: batch.map((entry, i) => ({
+              id: entry.id,
+              // pgvector text form at single precision - roughly half the
+              // payload of JSON.stringify's full double-precision output
+              embedding: serializeEmbedding(result.embeddings[i]),
+            })),
+          }
+        )
 
         if (updateError) {
-          const errMsg = `Failed to update ${entry.id}: ${updateError.message}`
+          const errMsg = `Failed to update batch starting at ${batch[0].id}: ${updateError.message}`
           errors.push(errMsg)
           console.error(`  ❌ ${errMsg}`)
-        } else {
-          successCount++
-          totalTokens += result.tokens
-          console.log(`  ✅ Generated (${result.tokens} tokens)`)
+          return
         }
-      } else {
-        const errMsg = `Failed to generate embedding for ${entry.id}`
+
+        successCount += updatedCount ?? batch.length
+
+        console.log(`  ✅ Batch complete (${result.tokens} tokens)`)
+      } catch (error) {
+        const errMsg = `Error processing batch starting at ${batch[0].id}: ${error}`
         errors.push(errMsg)
         console.error(`  ❌ ${errMsg}`)
       }
+    }
 
-      // Rate limiting: small delay between requests
-      if (i < knowledge.length - 1) {
-        await new Promise(resolve => setTimeout(resolve, 100))
-      }
-    } catch (error) {
-      const errMsg = `Error processing ${entry.id}: ${error}`
-      errors.push(errMsg)
-      console.error(`  ❌ ${errMsg}`)
+    await Promise.all(
+      Array.from({ length: Math.min(MAX_CONCURRENT_BATCHES, batches.length) }, () => worker())
+    )
+
+    // If an entire page made no progress, stop instead of refetching the
+    // same failing rows forever
+    if (successCount === pageStartSuccess) {
+      console.error('❌ No progress on last page, stopping')
+      break
     }
   }
 
@@ -169,7 +198,7 @@ async function main() {
   console.log('\n' + '='.repeat(60))
   console.log('📊 Summary')
   console.log('='.repeat(60))
-  console.log(`✅ Successfully processed: ${successCount}/${knowledge.length}`)
+  console.log(`✅ Successfully processed: ${successCount}/${totalSeen}`)
   console.log(`📝 Total tokens used: ${totalTokens.toLocaleString()}`)
   console.log(`💰 Estimated cost: $${estimatedCost.toFixed(4)}`)
 
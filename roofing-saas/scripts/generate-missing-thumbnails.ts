@@ -30,6 +30,10 @@ if (!SUPABASE_URL || !SUPABASE_SERVICE_KEY) {
 
 const supabase = createClient(SUPABASE_URL, SUPABASE_SERVICE_KEY)
 
+// Photos processed in parallel - kept modest so sharp's CPU work and the
+// storage API both stay comfortable
+const CONCURRENCY = 4
+
 interface Photo {
   id: string
   file_url: string
@@ -65,12 +69,25 @@ async function generateThumbnail(imageBuffer: Buffer): Promise<Buffer> {
 }
 
 async function downloadImage(url: string): Promise<Buffer> {
-  const response = await fetch(url)
-  if (!response.ok) {
-    throw new Error(`Failed to download: ${response.status} ${response.statusText}`)
+  // Back off only when the server actually rate limits (429), honoring
+  // Retry-After, instead of paying a fixed delay on every photo
+  for (let attempt = 0; ; attempt++) {
+    const response = await fetch(url)
+
+    if (response.status === 429 && attempt < 3) {
+      const retryAfter = Number(response.headers.get('retry-after')) || 2 ** attempt
+      const waitMs = retryAfter * 1000 + Math.random() * 250
+      console.log(`  Rate limited, retrying in ${Math.ceil(waitMs / 1000)}s...`)
+      await new Promise(resolve => setTimeout(resolve, waitMs))
+      continue
+    }
+
+    if (!response.ok) {
+      throw new Error(`Failed to download: ${response.status} ${response.statusText}`)
+    }
+    const arrayBuffer = await response.arrayBuffer()
+    return Buffer.from(arrayBuffer)
   }
-  const arrayBuffer = await response.arrayBuffer()
-  return Buffer.from(arrayBuffer)
 }
 
 async function processPhoto(photo: Photo, dryRun: boolean): Promise<boolean> {
@@ -183,19 +200,23 @@ async function main() {
   console.log(`Found ${photos.length} photos to process`)
   console.log('')
 
-  // Process each photo
-  for (let i = 0; i < photos.length; i++) {
-    const photo = photos[i]
-    console.log(`[${i + 1}/${photos.length}] Photo ${photo.id.substring(0, 8)}...`)
-    stats.processed++
-
-    await processPhoto(photo, dryRun)
-
-    // Small delay to avoid rate limiting
-    if (!dryRun && i < photos.length - 1) {
-      await new Promise(resolve => setTimeout(resolve, 100))
+  // Each photo is download -> resize -> upload -> update, dominated by
+  // network waits, so overlap a bounded number of photos instead of
+  // processing one at a time
+  let nextPhoto = 0
+  const worker = async () => {
+    while (nextPhoto < photos.length) {
+      const i = nextPhoto++
+      const photo = photos[i]
+      console.log(`[${i + 1}/${photos.length}] Photo ${photo.id.substring(0, 8)}...`)
+      stats.processed++
+
+      await processPhoto(photo, dryRun)
     }
   }
+  await Promise.all(
+    Array.from({ length: Math.min(CONCURRENCY, photos.length) }, () => worker())
+  )
 
   // Print summary
   console.log('')
@@ -0,0 +1,232 @@
+/**
+ * Shared embedding helpers for service scripts
+ *
+ * generate-knowledge-embeddings, sync-to-knowledge-base, and
+ * test-knowledge-search each carried their own copy of the OpenAI client,
+ * input clamping, and vector serialization. This module is the single
+ * implementation: one shared client (pooled connections, SDK retries on
+ * 429/5xx), one batched call per 100 inputs, and a content-addressed disk
+ * cache so re-runs of any script skip API calls for unchanged text.
+ *
+ * Scripts deliberately do not import from lib/ - app modules pull in the
+ * @/ path alias and the structured logger, neither of which tsx scripts use.
+ */
+
+import OpenAI from 'openai'
+import * as crypto from 'crypto'
+import * as fs from 'fs'
+import * as path from 'path'
+
+export const EMBEDDING_MODEL = 'text-embedding-3-small'
+export const EMBEDDING_DIMENSIONS = 1536
+
+// Per-input limit for text-embedding-3-* is 8192 tokens; clamp slightly
+// below that since the ~4 chars/token estimate is approximate
+const MAX_INPUT_TOKENS = 8000
+
+const MAX_BATCH_SIZE = 100 // OpenAI limit on inputs per request
+const BATCH_TOKEN_BUDGET = 200_000 // Stay under the ~300k tokens-per-request ceiling
+const MAX_IN_FLIGHT_REQUESTS = 4 // Concurrent embedding requests when many batches are queued
+
+let _client: OpenAI | null = null
+
+function getClient(): OpenAI {
+  if (!_client) {
+    const apiKey = process.env.OPENAI_API_KEY
+    if (!apiKey) {
+      throw new Error('OPENAI_API_KEY not configured')
+    }
+    _client = new OpenAI({ apiKey, maxRetries: 3 })
+  }
+  return _client
+}
+
+/**
+ * Truncate text to the embedding model's input window, measured in
+ * estimated tokens (~4 characters each) rather than characters
+ */
+export function clampToTokenLimit(text: string): string {
+  if (Math.ceil(text.length / 4) <= MAX_INPUT_TOKENS) {
+    return text
+  }
+  // Cut at the last whitespace inside the window so the final token is a
+  // whole word rather than an arbitrary character fragment
+  const truncated = text.slice(0, MAX_INPUT_TOKENS * 4)
+  const lastSpace = truncated.lastIndexOf(' ')
+  return lastSpace > truncated.length / 2 ? truncated.slice(0, lastSpace) : truncated
+}
+
+/**
+ * Serialize an embedding to pgvector's text format at single precision
+ * (7 significant digits) - pgvector stores float32 lanes anyway, and this
+ * roughly halves the payload vs full double-precision formatting
+ */
+export function serializeEmbedding(embedding: number[]): string {
+  let result = '['
+  for (let i = 0; i < embedding.length; i++) {
+    if (i > 0) result += ','
+    result += embedding[i].toPrecision(7)
+  }
+  return result + ']'
+}
+
+/**
+ * Estimate embedding cost: text-embedding-3-small is $0.02 per 1M tokens
+ */
+export function calculateEmbeddingCost(tokens: number): number {
+  return (tokens / 1_000_000) * 0.02
+}
+
+// Content-addressed on-disk embedding cache. Keyed on sha256(model + input
+// text); writes are best-effort. Delete the directory to force a re-embed.
+const EMBEDDING_CACHE_DIR = path.resolve(process.cwd(), '.embedding-cache')
+
+function embeddingCachePath(text: string): string {
+  const hash = crypto
+    .createHash('sha256')
+    .update(`${EMBEDDING_MODEL}\0${text}`)
+    .digest('hex')
+  return path.join(EMBEDDING_CACHE_DIR, `${hash}.json`)
+}
+
+function embeddingCacheRead(text: string): number[] | null {
+  try {
+    return JSON.parse(fs.readFileSync(embeddingCachePath(text), 'utf8'))
+  } catch {
+    return null
+  }
+}
+
+function embeddingCacheWrite(text: string, embedding: number[]): void {
+  try {
+    fs.mkdirSync(EMBEDDING_CACHE_DIR, { recursive: true })
+    fs.writeFileSync(embeddingCachePath(text), JSON.stringify(embedding))
+  } catch {
+    // A failed cache write just means the next run pays the API call
+  }
+}
+
+export interface BatchEmbeddingResult {
+  embeddings: number[][]
+  /** API tokens billed for this call - cache hits cost 0 */
+  tokens: number
+}
+
+/**
+ * Generate an embedding for a single text
+ */
+export async function generateEmbedding(text: string): Promise<number[]> {
+  text = clampToTokenLimit(text)
+
+  const cached = embeddingCacheRead(text)
+  if (cached) {
+    return cached
+  }
+
+  const response = await getClient().embeddings.create({
+    model: EMBEDDING_MODEL,
+    input: text,
+    dimensions: EMBEDDING_DIMENSIONS,
+  })
+
+  embeddingCacheWrite(text, response.data[0].embedding)
+  return response.data[0].embedding
+}
+
+/**
+ * Generate embeddings for many texts in one API call, in input order.
+ * Cache hits are served from disk; only the misses go to OpenAI.
+ */
+export async function generateEmbeddingsBatch(texts: string[]): Promise<BatchEmbeddingResult> {
+  texts = texts.map(clampToTokenLimit)
+
+  const embeddings: number[][] = new Array(texts.length)
+  const missing: number[] = []
+
+  for (let i = 0; i < texts.length; i++) {
+    const cached = embeddingCacheRead(texts[i])
+    if (cached) {
+      embeddings[i] = cached
+    } else {
+      missing.push(i)
+    }
+  }
+
+  if (missing.length === 0) {
+    return { embeddings, tokens: 0 }
+  }
+
+  // Identical inputs (duplicate records happen in CRM data) are embedded
+  // once and fanned back out to every position that asked for them
+  const firstIndexOf = new Map<string, number>()
+  const duplicates: number[] = []
+  const uniqueMissing: number[] = []
+  for (const i of missing) {
+    if (firstIndexOf.has(texts[i])) {
+      duplicates.push(i)
+    } else {
+      firstIndexOf.set(texts[i], i)
+      uniqueMissing.push(i)
+    }
+  }
+
+  // Sort the misses by length, then greedily pack batches under both the
+  // input-count limit and a token budget. Length-sorted packing keeps each
+  // request's inputs uniform - a short+long mix wastes throughput since the
+  // call's latency is gated by the longest input - and the token budget
+  // prevents oversized-request rejections that count-only slicing can hit.
+  const order = [...uniqueMissing].sort((a, b) => texts[a].length - texts[b].length)
+
+  const batches: number[][] = []
+  let currentBatch: number[] = []
+  let currentTokens = 0
+  for (const index of order) {
+    const tokens = Math.ceil(texts[index].length / 4)
+    if (
+      currentBatch.length > 0 &&
+      (currentBatch.length >= MAX_BATCH_SIZE || currentTokens + tokens > BATCH_TOKEN_BUDGET)
+    ) {
+      batches.push(currentBatch)
+      currentBatch = []
+      currentTokens = 0
+    }
+    currentBatch.push(index)
+    currentTokens += tokens
+  }
+  if (currentBatch.length > 0) {
+    batches.push(currentBatch)
+  }
+
+  // The calls are independent and RTT-bound, so keep a bounded number in
+  // flight instead of issuing them strictly one after another
+  let totalTokens = 0
+  let nextBatch = 0
+  const worker = async () => {
+    while (nextBatch < batches.length) {
+      const batch = batches[nextBatch++]
+      const response = await getClient().embeddings.create({
+        model: EMBEDDING_MODEL,
+        input: batch.map(i => texts[i]),
+        dimensions: EMBEDDING_DIMENSIONS,
+      })
+
+      // Results carry an index field (position within the request) - map back
+      // to the original input order
+      for (const item of response.data) {
+        const originalIndex = batch[item.index]
+        embeddings[originalIndex] = item.embedding
+        embeddingCacheWrite(texts[originalIndex], item.embedding)
+      }
+      totalTokens += response.usage.total_tokens
+    }
+  }
+  await Promise.all(
+    Array.from({ length: Math.min(MAX_IN_FLIGHT_REQUESTS, batches.length) }, () => worker())
+  )
+
+  for (const i of duplicates) {
+    embeddings[i] = embeddings[firstIndexOf.get(texts[i])!]
+  }
+
+  return { embeddings, tokens: totalTokens }
+}
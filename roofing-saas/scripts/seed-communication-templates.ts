@@ -345,86 +345,94 @@ async function getTenants(): Promise<{ id: string; name: string }[]> {
 }
 
 async function seedSMSTemplates(tenantId: string, tenantName: string): Promise<number> {
-  let seeded = 0
-
-  for (const template of SMS_TEMPLATES) {
-    // Check if template with same name already exists
-    const { data: existing } = await supabase
-      .from('sms_templates')
-      .select('id')
-      .eq('tenant_id', tenantId)
-      .eq('name', template.name)
-      .single()
+  // One query for all existing names instead of one per template
+  const { data: existing } = await supabase
+    .from('sms_templates')
+    .select('name')
+    .eq('tenant_id', tenantId)
+    .in('name', SMS_TEMPLATES.map(t => t.name))
+
+  const existingNames = new Set((existing || []).map(t => t.name))
 
-    if (existing) {
+  const toInsert = SMS_TEMPLATES.filter(template => {
+    if (existingNames.has(template.name)) {
       console.log(`  ⏭️  SMS template "${template.name}" already exists, skipping`)
-      continue
+      return false
     }
+    return true
+  })
 
-    const { error } = await supabase
-      .from('sms_templates')
-      .insert({
-        tenant_id: tenantId,
-        name: template.name,
-        description: template.description,
-        message: template.message,
-        category: template.category,
-        available_variables: template.available_variables,
-        is_active: template.is_active,
-        is_default: template.is_default,
-      })
-
-    if (error) {
-      console.error(`  ❌ Failed to seed SMS template "${template.name}":`, error.message)
-    } else {
-      console.log(`  ✅ SMS template: ${template.name}`)
-      seeded++
-    }
+  if (toInsert.length === 0) {
+    return 0
+  }
+
+  // Single bulk INSERT for all missing templates
+  const { error } = await supabase
+    .from('sms_templates')
+    .insert(toInsert.map(template => ({
+      tenant_id: tenantId,
+      name: template.name,
+      description: template.description,
+      message: template.message,
+      category: template.category,
+      available_variables: template.available_variables,
+      is_active: template.is_active,
+      is_default: template.is_default,
+    })))
+
+  if (error) {
+    console.error(`  ❌ Failed to seed SMS templates:`, error.message)
+    return 0
   }
 
-  return seeded
+  toInsert.forEach(template => console.log(`  ✅ SMS template: ${template.name}`))
+  return toInsert.length
 }
 
 async function seedEmailTemplates(tenantId: string, tenantName: string): Promise<number> {
-  let seeded = 0
-
-  for (const template of EMAIL_TEMPLATES) {
-    // Check if template with same name already exists
-    const { data: existing } = await supabase
-      .from('email_templates')
-      .select('id')
-      .eq('tenant_id', tenantId)
-      .eq('name', template.name)
-      .single()
+  // One query for all existing names instead of one per template
+  const { data: existing } = await supabase
+    .from('email_templates')
+    .select('name')
+    .eq('tenant_id', tenantId)
+    .in('name', EMAIL_TEMPLATES.map(t => t.name))
+
+  const existingNames = new Set((existing || []).map(t => t.name))
 
-    if (existing) {
+  const toInsert = EMAIL_TEMPLATES.filter(template => {
+    if (existingNames.has(template.name)) {
       console.log(`  ⏭️  Email template "${template.name}" already exists, skipping`)
-      continue
+      return false
     }
+    return true
+  })
 
-    const { error } = await supabase
-      .from('email_templates')
-      .insert({
-        tenant_id: tenantId,
-        name: template.name,
-        description: template.description,
-        subject: template.subject,
-        body: template.body,
-        category: template.category,
-        available_variables: template.available_variables,
-        is_active: template.is_active,
-        is_default: template.is_default,
-      })
-
-    if (error) {
-      console.error(`  ❌ Failed to seed email template "${template.name}":`, error.message)
-    } else {
-      console.log(`  ✅ Email template: ${template.name}`)
-      seeded++
-    }
+  if (toInsert.length === 0) {
+    return 0
+  }
+
+  // Single bulk INSERT for all missing templates
+  const { error } = await supabase
+    .from('email_templates')
+    .insert(toInsert.map(template => ({
+      tenant_id: tenantId,
+      name: template.name,
+      description: template.description,
+      subject: template.subject,
+      body: template.body,
+      category: template.category,
+      available_variables: template.available_variables,
+      is_active: template.is_active,
+      is_default: template.is_default,
+    })))
+
+  if (error) {
+    console.error(`  ❌ Failed to seed email templates:`, error.message)
+    return 0
   }
 
-  return seeded
+  toInsert.forEach(template => console.log(`  ✅ Email template: ${template.name}`))
+  return toInsert.length
 }
 
 async function main() {
@@ -162,51 +162,42 @@ async function seedStormData() {
     console.warn('Warning cleaning events:', cleanupEventsError.message)
   }
 
-  // Insert storm events
+  // Insert storm events with one bulk INSERT instead of one POST per row
   console.log('\n📊 Inserting storm events...')
-  const stormEventIds: string[] = []
-
-  for (const storm of DEMO_STORMS) {
-    const { data, error } = await supabase
-      .from('storm_events')
-      .insert({
-        tenant_id: USER_ID,
-        ...storm,
-      })
-      .select('id')
-      .single()
-
-    if (error) {
-      console.error(`❌ Failed to insert ${storm.city} storm:`, error.message)
-      continue
-    }
-
-    stormEventIds.push(data.id)
-    console.log(`✅ ${storm.city} ${storm.event_type} (${storm.event_date}) - ID: ${data.id.slice(0, 8)}...`)
-  }
 
-  if (stormEventIds.length === 0) {
-    console.error('❌ No storm events were created')
+  const { data: insertedStorms, error: stormsError } = await supabase
+    .from('storm_events')
+    .insert(DEMO_STORMS.map(storm => ({
+      tenant_id: USER_ID,
+      ...storm,
+    })))
+    .select('id')
+
+  if (stormsError || !insertedStorms || insertedStorms.length === 0) {
+    console.error('❌ No storm events were created:', stormsError?.message)
     process.exit(1)
   }
 
-  // Insert alerts
+  const stormEventIds = insertedStorms.map(s => s.id)
+  DEMO_STORMS.forEach((storm, i) => {
+    console.log(`✅ ${storm.city} ${storm.event_type} (${storm.event_date}) - ID: ${stormEventIds[i].slice(0, 8)}...`)
+  })
+
+  // Insert alerts - same single bulk INSERT pattern
   console.log('\n🚨 Inserting storm alerts...')
   const alerts = createDemoAlerts(stormEventIds)
 
-  for (const alert of alerts) {
-    const { data, error } = await supabase
-      .from('storm_alerts')
-      .insert(alert)
-      .select('id')
-      .single()
-
-    if (error) {
-      console.error(`❌ Failed to insert alert:`, error.message)
-      continue
-    }
-
-    console.log(`✅ Alert: ${alert.type} (${alert.priority}) - ID: ${data.id.slice(0, 8)}...`)
+  const { data: insertedAlerts, error: alertsError } = await supabase
+    .from('storm_alerts')
+    .insert(alerts)
+    .select('id')
+
+  if (alertsError) {
+    console.error(`❌ Failed to insert alerts:`, alertsError.message)
+  } else {
+    alerts.forEach((alert, i) => {
+      console.log(`✅ Alert: ${alert.type} (${alert.priority}) - ID: ${insertedAlerts![i].id.slice(0, 8)}...`)
+    })
   }
 
   // Summary
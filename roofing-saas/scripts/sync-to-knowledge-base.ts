@@ -14,8 +14,8 @@
 
 import { config } from 'dotenv'
 import { createClient } from '@supabase/supabase-js'
-import OpenAI from 'openai'
 import * as path from 'path'
+import { generateEmbeddingsBatch, serializeEmbedding } from './lib/embeddings'
 
 // Load environment variables
 config({ path: path.resolve(process.cwd(), '.env.local') })
@@ -36,7 +36,6 @@ if (!OPENAI_API_KEY) {
 }
 
 const supabase = createClient(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-const openai = new OpenAI({ apiKey: OPENAI_API_KEY })
 
 interface SyncStats {
   processed: number
@@ -46,6 +45,12 @@ interface SyncStats {
   errorDetails: Array<{ id: string; error: string }>
 }
 
+// Rows per bulk INSERT/UPSERT - one POST carries the whole array
+const INSERT_BATCH_SIZE = 100
+
+// Texts per OpenAI embeddings call (API accepts arrays of inputs)
+const EMBED_BATCH_SIZE = 100
+
 /**
  * Transform project to searchable text chunk
  */
@@ -54,150 +59,107 @@ function projectToChunk(project: any): string {
     ? JSON.parse(project.custom_fields)
     : project.custom_fields || {}
 
-  return `
-Project: ${project.name} (#${project.project_number})
-Status: ${project.status}
-Type: ${project.type || 'Not specified'}
-Pipeline: ${customFields.proline_pipeline || 'N/A'}
-Stage: ${customFields.proline_stage || 'N/A'}
-Assigned to: ${customFields.assigned_to || 'Unassigned'}
-
-Description: ${project.description || 'No description'}
-Scope of Work: ${project.scope_of_work || 'Not specified'}
-
-Financial:
-- Estimated Value: $${project.estimated_value || 0}
-- Approved Value: $${project.approved_value || 0}
-
-Services: ${customFields.services || 'Not specified'}
-Category: ${customFields.category || 'Not specified'}
-Tags: ${Array.isArray(customFields.tags) ? customFields.tags.join(', ') : 'None'}
+  // Only emit populated fields - "Not specified" filler carries no search
+  // signal but still costs embedding tokens on every record
+  const lines = [
+    `Project: ${project.name} (#${project.project_number})`,
+    `Status: ${project.status}`,
+    project.type && `Type: ${project.type}`,
+    customFields.proline_pipeline && `Pipeline: ${customFields.proline_pipeline}`,
+    customFields.proline_stage && `Stage: ${customFields.proline_stage}`,
+    customFields.assigned_to && `Assigned to: ${customFields.assigned_to}`,
+    project.description && `Description: ${project.description}`,
+    project.scope_of_work && `Scope of Work: ${project.scope_of_work}`,
+    project.estimated_value && `Estimated Value: $${project.estimated_value}`,
+    project.approved_value && `Approved Value: $${project.approved_value}`,
+    customFields.services && `Services: ${customFields.services}`,
+    customFields.category && `Category: ${customFields.category}`,
+    Array.isArray(customFields.tags) && customFields.tags.length > 0 &&
+      `Tags: ${customFields.tags.join(', ')}`,
+    customFields.location && `Location: ${customFields.location}`,
+    customFields.address?.line1 &&
+      `Address: ${customFields.address.line1} ${customFields.address.city || ''}, ${customFields.address.state || ''}`.trim(),
+  ]
 
-Location: ${customFields.location || 'Not specified'}
-Address: ${customFields.address?.line1 || ''} ${customFields.address?.city || ''}, ${customFields.address?.state || ''}
-  `.trim()
+  return lines.filter(Boolean).join('\n')
 }
 
 /**
  * Transform contact to searchable text chunk
  */
 function contactToChunk(contact: any): string {
-  return `
-Contact: ${contact.first_name} ${contact.last_name}
-Email: ${contact.email || 'Not provided'}
-Phone: ${contact.phone || 'Not provided'}
-
-Type: ${contact.type || 'General'}
-Status: ${contact.status || 'Active'}
-
-Company: ${contact.company || 'N/A'}
-Address: ${contact.address || 'Not specified'}
-
-Tags: ${Array.isArray(contact.tags) ? contact.tags.join(', ') : 'None'}
-Notes: ${contact.notes || 'No notes'}
-  `.trim()
-}
-
-/**
- * Generate embedding using OpenAI
- */
-async function generateEmbedding(text: string): Promise<number[]> {
-  const response = await openai.embeddings.create({
-    model: 'text-embedding-3-small',
-    input: text,
-    dimensions: 1536,
-  })
+  const lines = [
+    `Contact: ${contact.first_name} ${contact.last_name}`,
+    contact.email && `Email: ${contact.email}`,
+    contact.phone && `Phone: ${contact.phone}`,
+    `Type: ${contact.type || 'General'}`,
+    `Status: ${contact.status || 'Active'}`,
+    contact.company && `Company: ${contact.company}`,
+    contact.address && `Address: ${contact.address}`,
+    Array.isArray(contact.tags) && contact.tags.length > 0 && `Tags: ${contact.tags.join(', ')}`,
+    contact.notes && `Notes: ${contact.notes}`,
+  ]
 
-  return response.data[0].embedding
+  return lines.filter(Boolean).join('\n')
 }
 
 /**
- * Check if knowledge base entry exists
+ * Build a knowledge_base row for a CRM record
  */
-async function entryExists(sourceId: string, sourceType: string): Promise<{ exists: boolean; id?: string }> {
-  const { data, error } = await supabase
-    .from('knowledge_base')
-    .select('id')
-    .eq('source_id', sourceId)
-    .eq('source_type', sourceType)
-    .maybeSingle()
-
-  if (error) {
-    console.error(`Error checking entry existence:`, error)
-    return { exists: false }
+function toKnowledgeBaseRow(
+  record: any,
+  sourceType: 'project' | 'contact',
+  content: string,
+  embedding: number[]
+) {
+  return {
+    tenant_id: DEFAULT_TENANT_ID,
+    source_id: record.id,
+    source_type: sourceType,
+    title: sourceType === 'project'
+      ? `${record.name} (#${record.project_number})`
+      : `${record.first_name} ${record.last_name}`,
+    content: content,
+    embedding: serializeEmbedding(embedding),
+    metadata: {
+      [sourceType === 'project' ? 'project_number' : 'email']:
+        sourceType === 'project' ? record.project_number : record.email,
+      status: record.status,
+      updated_at: new Date().toISOString(),
+    },
   }
-
-  return { exists: !!data, id: data?.id }
 }
 
 /**
- * Sync a single record to knowledge base
+ * Fetch the knowledge_base entries already synced for a source type, keyed
+ * by source_id (paginate - PostgREST caps unbounded selects at 1000). The
+ * stored content comes along so callers can skip records whose chunk text
+ * has not changed since the last sync.
  */
-async function syncRecord(
-  record: any,
-  sourceType: 'project' | 'contact',
-  stats: SyncStats
-): Promise<void> {
-  try {
-    // Transform to searchable text
-    const content = sourceType === 'project'
-      ? projectToChunk(record)
-      : contactToChunk(record)
-
-    // Generate embedding
-    console.log(`   Generating embedding for ${record.name || `${record.first_name} ${record.last_name}`}...`)
-    const embedding = await generateEmbedding(content)
-
-    // Check if exists
-    const { exists, id } = await entryExists(record.id, sourceType)
-
-    const knowledgeBaseData = {
-      tenant_id: DEFAULT_TENANT_ID,
-      source_id: record.id,
-      source_type: sourceType,
-      title: sourceType === 'project'
-        ? `${record.name} (#${record.project_number})`
-        : `${record.first_name} ${record.last_name}`,
-      content: content,
-      embedding: `[${embedding.join(',')}]`, // PostgreSQL vector format
-      metadata: {
-        [sourceType === 'project' ? 'project_number' : 'email']:
-          sourceType === 'project' ? record.project_number : record.email,
-        status: record.status,
-        updated_at: new Date().toISOString(),
-      },
-    }
+async function fetchSyncedEntries(
+  sourceType: 'project' | 'contact'
+): Promise<Map<string, { id: string; content: string }>> {
+  const synced = new Map<string, { id: string; content: string }>()
+  let page = 0
+  const pageSize = 1000
 
-    if (exists) {
-      // UPDATE
-      const { error } = await supabase
-        .from('knowledge_base')
-        .update({ ...knowledgeBaseData, updated_at: new Date().toISOString() })
-        .eq('id', id)
+  while (true) {
+    const { data: syncedPage } = await supabase
+      .from('knowledge_base')
+      .select('id, source_id, content')
+      .eq('source_type', sourceType)
+      .range(page * pageSize, (page + 1) * pageSize - 1)
 
-      if (error) throw error
-      stats.updated++
-      console.log(`   ✅ Updated: ${knowledgeBaseData.title}`)
-    } else {
-      // INSERT
-      const { error } = await supabase
-        .from('knowledge_base')
-        .insert(knowledgeBaseData)
-
-      if (error) throw error
-      stats.created++
-      console.log(`   🆕 Created: ${knowledgeBaseData.title}`)
-    }
+    if (!syncedPage || syncedPage.length === 0) break
 
-    stats.processed++
-  } catch (error: any) {
-    stats.errors++
-    stats.errorDetails.push({
-      id: record.id,
-      error: error.message,
-    })
-    console.error(`   ❌ Error: ${error.message}`)
+    for (const entry of syncedPage) {
+      synced.set(entry.source_id, { id: entry.id, content: entry.content })
+    }
+    if (syncedPage.length < pageSize) break
+    page++
   }
+
+  return synced
 }
 
 /**
@@ -214,29 +176,18 @@ async function syncProjects(limit?: number): Promise<SyncStats> {
     errorDetails: [],
   }
 
-  // Fetch ALL synced project IDs (paginate if needed)
-  let allSyncedIds: string[] = []
-  let page = 0
-  const pageSize = 1000
-
-  while (true) {
-    const { data: syncedPage } = await supabase
-      .from('knowledge_base')
-      .select('source_id')
-      .eq('source_type', 'project')
-      .range(page * pageSize, (page + 1) * pageSize - 1)
-
-    if (!syncedPage || syncedPage.length === 0) break
+  // Fetch ALL synced project IDs
+  const syncedEntries = await fetchSyncedEntries('project')
 
-    allSyncedIds.push(...syncedPage.map(s => s.source_id))
-    if (syncedPage.length < pageSize) break
-    page++
-  }
+  console.log(`   Already synced: ${syncedEntries.size} projects\n`)
 
-  // Fetch ALL projects (paginate if needed)
-  let allProjects: any[] = []
+  // Stream pages instead of materializing every project up front: each page
+  // is filtered, embedded, and inserted before the next one is fetched, so
+  // peak memory stays at one page of rows and the first embedding call fires
+  // before the last page has been read
   let projectPage = 0
   const projectPageSize = 1000
+  let fetched = 0
 
   while (true) {
     const { data: projectsPage, error: fetchError } = await supabase
@@ -252,31 +203,62 @@ async function syncProjects(limit?: number): Promise<SyncStats> {
     }
 
     if (!projectsPage || projectsPage.length === 0) break
+    fetched += projectsPage.length
+
+    // Filter to only unsynced projects
+    const projects = projectsPage.filter(p => !syncedEntries.has(p.id))
+    console.log(`   Page ${projectPage + 1}: ${projectsPage.length} fetched, ${projects.length} new`)
+
+    // All of these projects are known to be new, so embed them in batches -
+    // one API call per 100 projects instead of one per project - and insert
+    // the rows as arrays
+    const rows: ReturnType<typeof toKnowledgeBaseRow>[] = []
+
+    for (let i = 0; i < projects.length; i += EMBED_BATCH_SIZE) {
+      const batch = projects.slice(i, i + EMBED_BATCH_SIZE)
+
+      try {
+        const contents = batch.map(projectToChunk)
+        console.log(`   Embedding ${batch.length} projects in one call...`)
+        const { embeddings } = await generateEmbeddingsBatch(contents)
+
+        batch.forEach((project, j) => {
+          rows.push(toKnowledgeBaseRow(project, 'project', contents[j], embeddings[j]))
+        })
+        stats.processed += batch.length
+        console.log(`   Progress: ${stats.processed} embedded`)
+      } catch (error: any) {
+        stats.errors += batch.length
+        stats.errorDetails.push({
+          id: `batch ${i}-${i + batch.length}`,
+          error: error.message,
+        })
+        console.error(`   ❌ Embedding batch error: ${error.message}`)
+      }
+    }
+
+    for (let i = 0; i < rows.length; i += INSERT_BATCH_SIZE) {
+      const batch = rows.slice(i, i + INSERT_BATCH_SIZE)
+      const { error } = await supabase.from('knowledge_base').insert(batch)
+
+      if (error) {
+        stats.errors += batch.length
+        stats.errorDetails.push({
+          id: `batch ${i}-${i + batch.length}`,
+          error: error.message,
+        })
+        console.error(`   ❌ Batch insert error: ${error.message}`)
+      } else {
+        stats.created += batch.length
+        console.log(`   ✅ Inserted ${batch.length} projects`)
+      }
+    }
 
-    allProjects.push(...projectsPage)
     if (projectsPage.length < projectPageSize) break
     projectPage++
   }
 
-  // Use already-fetched synced IDs
-  const syncedIds = new Set(allSyncedIds)
-
-  // Filter to only unsynced projects
-  const projects = allProjects.filter(p => !syncedIds.has(p.id))
-
-  console.log(`   Already synced: ${syncedIds.size} projects`)
-  console.log(`   Fetched: ${allProjects?.length || 0} projects`)
-  console.log(`   To sync: ${projects.length} new projects\n`)
-
-  for (const project of projects) {
-    await syncRecord(project, 'project', stats)
-
-    // Rate limit: 500 requests/min for OpenAI
-    if (stats.processed % 10 === 0) {
-      console.log(`   Progress: ${stats.processed}/${projects.length}`)
-      await new Promise(resolve => setTimeout(resolve, 100)) // Small delay
-    }
-  }
+  console.log(`   Fetched: ${fetched} projects total\n`)
 
   return stats
 }
@@ -316,12 +298,94 @@ async function syncContacts(limit?: number): Promise<SyncStats> {
 
   console.log(`Found ${contacts.length} contacts\n`)
 
+  const syncedEntries = await fetchSyncedEntries('contact')
+
+  // Skip contacts whose chunk text matches what is already stored - their
+  // embedding and row would come out identical, so re-embedding and
+  // re-updating them is pure waste on every run
+  const pending: { contact: any; content: string; entryId?: string }[] = []
+  let unchanged = 0
   for (const contact of contacts) {
-    await syncRecord(contact, 'contact', stats)
+    const content = contactToChunk(contact)
+    const existing = syncedEntries.get(contact.id)
+    if (existing && existing.content === content) {
+      unchanged++
+      continue
+    }
+    pending.push({ contact, content, entryId: existing?.id })
+  }
 
-    if (stats.processed % 10 === 0) {
-      console.log(`   Progress: ${stats.processed}/${contacts.length}`)
-      await new Promise(resolve => setTimeout(resolve, 100))
+  console.log(`   Unchanged since last sync (skipped): ${unchanged}`)
+  console.log(`   To embed: ${pending.length}\n`)
+
+  // Embed the rest in batches - one API call per 100 contacts instead of
+  // one per contact - then split into new rows (bulk INSERT) and
+  // already-synced rows (bulk UPSERT keyed on the existing entry id)
+  const newRows: ReturnType<typeof toKnowledgeBaseRow>[] = []
+  const updates: (ReturnType<typeof toKnowledgeBaseRow> & { id: string; updated_at: string })[] = []
+
+  for (let i = 0; i < pending.length; i += EMBED_BATCH_SIZE) {
+    const batch = pending.slice(i, i + EMBED_BATCH_SIZE)
+
+    try {
+      console.log(`   Embedding ${batch.length} contacts in one call...`)
+      const { embeddings } = await generateEmbeddingsBatch(batch.map(item => item.content))
+
+      batch.forEach((item, j) => {
+        const row = toKnowledgeBaseRow(item.contact, 'contact', item.content, embeddings[j])
+        if (item.entryId) {
+          updates.push({ ...row, id: item.entryId, updated_at: new Date().toISOString() })
+        } else {
+          newRows.push(row)
+        }
+      })
+      stats.processed += batch.length
+      console.log(`   Progress: ${stats.processed}/${pending.length}`)
+    } catch (error: any) {
+      stats.errors += batch.length
+      stats.errorDetails.push({
+        id: `batch ${i}-${i + batch.length}`,
+        error: error.message,
+      })
+      console.error(`   ❌ Embedding batch error: ${error.message}`)
+    }
+  }
+
+  for (let i = 0; i < newRows.length; i += INSERT_BATCH_SIZE) {
+    const batch = newRows.slice(i, i + INSERT_BATCH_SIZE)
+    const { error: insertError } = await supabase.from('knowledge_base').insert(batch)
+
+    if (insertError) {
+      stats.errors += batch.length
+      stats.errorDetails.push({
+        id: `batch ${i}-${i + batch.length}`,
+        error: insertError.message,
+      })
+      console.error(`   ❌ Batch insert error: ${insertError.message}`)
+    } else {
+      stats.created += batch.length
+      console.log(`   ✅ Inserted ${batch.length} contacts`)
+    }
+  }
+
+  // Updates ride the same bulk path as inserts: an upsert keyed on the
+  // existing entry id turns N per-row PATCHes into one POST per batch
+  for (let i = 0; i < updates.length; i += INSERT_BATCH_SIZE) {
+    const batch = updates.slice(i, i + INSERT_BATCH_SIZE)
+    const { error: upsertError } = await supabase
+      .from('knowledge_base')
+      .upsert(batch, { onConflict: 'id' })
+
+    if (upsertError) {
+      stats.errors += batch.length
+      stats.errorDetails.push({
+        id: `batch ${i}-${i + batch.length}`,
+        error: upsertError.message,
+      })
+      console.error(`   ❌ Batch update error: ${upsertError.message}`)
+    } else {
+      stats.updated += batch.length
+      console.log(`   ✅ Updated ${batch.length} contacts`)
     }
   }
 
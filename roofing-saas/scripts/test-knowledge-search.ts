@@ -10,48 +10,14 @@
 import { createClient } from '@supabase/supabase-js'
 import * as dotenv from 'dotenv'
 import * as path from 'path'
+import { generateEmbedding, serializeEmbedding } from './lib/embeddings'
 
 // Load .env.local
 dotenv.config({ path: path.resolve(process.cwd(), '.env.local') })
 
-const OPENAI_API_KEY = process.env.OPENAI_API_KEY
 const SUPABASE_URL = process.env.NEXT_PUBLIC_SUPABASE_URL!
 const SUPABASE_SERVICE_ROLE_KEY = process.env.SUPABASE_SERVICE_ROLE_KEY!
 
-async function generateEmbedding(text: string): Promise<number[] | null> {
-  if (!OPENAI_API_KEY) {
-    console.error('❌ OPENAI_API_KEY not configured')
-    return null
-  }
-
-  try {
-    const response = await fetch('https://api.openai.com/v1/embeddings', {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        'Authorization': `Bearer ${OPENAI_API_KEY}`,
-      },
-      body: JSON.stringify({
-        model: 'text-embedding-3-small',
-        input: text,
-        encoding_format: 'float',
-      }),
-    })
-
-    if (!response.ok) {
-      const error = await response.text()
-      console.error('OpenAI API error:', response.status, error)
-      return null
-    }
-
-    const data = await response.json()
-    return data.data[0].embedding
-  } catch (error) {
-    console.error('Failed to generate embedding:', error)
-    return null
-  }
-}
-
 async function main() {
   const query = process.argv[2] || "What is the GAF System Plus warranty?"
 
@@ -62,12 +28,6 @@ async function main() {
   // Generate query embedding
   console.log('📝 Generating query embedding...')
   const embedding = await generateEmbedding(query)
-
-  if (!embedding) {
-    console.error('❌ Failed to generate embedding')
-    process.exit(1)
-  }
-
   console.log(`✅ Generated embedding (${embedding.length} dimensions)\n`)
 
   // Search knowledge base
@@ -81,7 +41,7 @@ async function main() {
   console.log('🔎 Searching knowledge base...')
 
   const { data: results, error } = await supabase.rpc('search_roofing_knowledge', {
-    query_embedding: JSON.stringify(embedding),
+    query_embedding: serializeEmbedding(embedding),
     match_threshold: 0.7,
     match_count: 3,
     filter_category: null,
@@ -0,0 +1,33 @@
+-- Migration: Bulk embedding update for roofing_knowledge
+-- Date: 2026-08-29
+-- Purpose: Replace one UPDATE round trip per knowledge entry with a single
+--          set-based UPDATE when backfilling embeddings in batches
+-- Rollback: DROP FUNCTION IF EXISTS update_knowledge_embeddings;
+
+CREATE OR REPLACE FUNCTION update_knowledge_embeddings(updates JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+SECURITY DEFINER
+AS $$
+  WITH payload AS (
+    SELECT
+      (u->>'id')::uuid AS id,
+      (u->>'embedding')::vector(1536) AS embedding
+    FROM jsonb_array_elements(updates) AS u
+  ),
+  updated AS (
+    UPDATE roofing_knowledge rk
+    SET embedding = p.embedding
+    FROM payload p
+    WHERE rk.id = p.id
+    RETURNING rk.id
+  )
+  SELECT COUNT(*)::integer FROM updated;
+$$;
+
+-- Only service role / admin callers should bulk-write embeddings. New
+-- functions are executable by PUBLIC by default and anon/authenticated
+-- inherit that grant, so PUBLIC must be revoked too or the function stays
+-- callable with the anon key via POST /rest/v1/rpc.
+REVOKE EXECUTE ON FUNCTION update_knowledge_embeddings(JSONB) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION update_knowledge_embeddings(JSONB) FROM anon, authenticated;
@@ -0,0 +1,57 @@
+-- Migration: Index-friendly rewrite of search_roofing_knowledge
+-- Date: 2026-08-29
+-- Purpose: The similarity threshold was part of the WHERE clause alongside
+--          ORDER BY embedding <=> query, forcing distance to be evaluated as
+--          a per-row filter expression rather than letting the HNSW index
+--          drive a pure top-K scan. Probe the index with ORDER BY + LIMIT
+--          first, then apply the threshold to the K candidates. Distance
+--          ordering guarantees every row above the threshold ranks before
+--          any row below it, so the result set is unchanged.
+-- Rollback: Re-apply the function body from 20251004000400_roofing_knowledge_base.sql
+
+CREATE OR REPLACE FUNCTION search_roofing_knowledge(
+  query_embedding vector(1536),
+  match_threshold float DEFAULT 0.7,
+  match_count int DEFAULT 5,
+  filter_category text DEFAULT NULL,
+  filter_tenant_id uuid DEFAULT NULL
+)
+RETURNS TABLE (
+  id uuid,
+  title text,
+  content text,
+  category text,
+  subcategory text,
+  manufacturer text,
+  similarity float
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  RETURN QUERY
+  SELECT c.id, c.title, c.content, c.category, c.subcategory, c.manufacturer, c.similarity
+  FROM (
+    -- Pure ORDER BY distance + LIMIT: eligible for the HNSW index scan
+    SELECT
+      rk.id,
+      rk.title,
+      rk.content,
+      rk.category,
+      rk.subcategory,
+      rk.manufacturer,
+      1 - (rk.embedding <=> query_embedding) AS similarity
+    FROM roofing_knowledge rk
+    WHERE
+      rk.is_active = TRUE
+      AND (filter_category IS NULL OR rk.category = filter_category)
+      AND (
+        rk.is_global = TRUE OR
+        (filter_tenant_id IS NOT NULL AND rk.tenant_id = filter_tenant_id)
+      )
+    ORDER BY rk.embedding <=> query_embedding
+    LIMIT match_count
+  ) c
+  WHERE c.similarity > match_threshold
+  ORDER BY c.similarity DESC;
+END;
+$$;
@@ -0,0 +1,18 @@
+-- Migration: HNSW index for knowledge_base embeddings
+-- Date: 2026-08-29
+-- Purpose: knowledge_base (hybrid RAG over projects/contacts) still used an
+--          IVFFlat index, which needs retraining as data grows and loses
+--          recall on incremental inserts. Replace it with HNSW, matching the
+--          roofing_knowledge index, for better recall/latency on a table
+--          that grows row by row with each CRM sync.
+-- Note: query-time recall can be tuned with `SET hnsw.ef_search = 80;`
+--       (default 40) in any session that needs higher accuracy.
+-- Rollback: DROP INDEX idx_knowledge_embedding;
+--           CREATE INDEX idx_knowledge_embedding ON knowledge_base
+--             USING ivfflat (embedding vector_cosine_ops);
+
+DROP INDEX IF EXISTS idx_knowledge_embedding;
+
+CREATE INDEX IF NOT EXISTS idx_knowledge_embedding ON knowledge_base
+USING hnsw (embedding vector_cosine_ops)
+WITH (m = 16, ef_construction = 64);
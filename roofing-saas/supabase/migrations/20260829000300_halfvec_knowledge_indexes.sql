@@ -0,0 +1,76 @@
+-- Migration: Half-precision (halfvec) HNSW index for roofing_knowledge
+-- Date: 2026-08-29
+-- Purpose: The HNSW index on roofing_knowledge stores full FP32 vectors -
+--          6KB per 1536-dim row - which dominates index memory as the table
+--          grows. pgvector 0.7+ supports halfvec (FP16), halving index size
+--          and speeding distance computation with minimal recall loss. Index
+--          an FP16 expression over the existing column: the stored
+--          embeddings stay FP32, the index probe runs at half precision, and
+--          the final similarity returned to callers is still computed
+--          against the full-precision column.
+-- Note: knowledge_base keeps its plain HNSW cosine index from
+--       20260829000200. Its consumer, match_documents, lives in the cloud
+--       schema (not in these migrations) and orders by the raw column, so a
+--       halfvec expression index there would be unusable - an expression
+--       index only helps when the query's ORDER BY matches the expression.
+-- Requires: pgvector >= 0.7 (halfvec type)
+-- Rollback: DROP INDEX idx_roofing_knowledge_embedding;
+--           CREATE INDEX idx_roofing_knowledge_embedding ON roofing_knowledge
+--             USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+--           Re-apply search_roofing_knowledge from 20260829000100_index_friendly_knowledge_search.sql
+
+-- Replace the FP32 HNSW index with an FP16 expression index
+DROP INDEX IF EXISTS idx_roofing_knowledge_embedding;
+CREATE INDEX idx_roofing_knowledge_embedding ON roofing_knowledge
+USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops)
+WITH (m = 16, ef_construction = 64);
+
+-- The expression index is only usable when the ORDER BY matches the indexed
+-- expression, so probe at half precision and keep the FP32 distance for the
+-- similarity actually returned to callers
+CREATE OR REPLACE FUNCTION search_roofing_knowledge(
+  query_embedding vector(1536),
+  match_threshold float DEFAULT 0.7,
+  match_count int DEFAULT 5,
+  filter_category text DEFAULT NULL,
+  filter_tenant_id uuid DEFAULT NULL
+)
+RETURNS TABLE (
+  id uuid,
+  title text,
+  content text,
+  category text,
+  subcategory text,
+  manufacturer text,
+  similarity float
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  RETURN QUERY
+  SELECT c.id, c.title, c.content, c.category, c.subcategory, c.manufacturer, c.similarity
+  FROM (
+    -- Half-precision ORDER BY distance + LIMIT: eligible for the halfvec HNSW scan
+    SELECT
+      rk.id,
+      rk.title,
+      rk.content,
+      rk.category,
+      rk.subcategory,
+      rk.manufacturer,
+      1 - (rk.embedding <=> query_embedding) AS similarity
+    FROM roofing_knowledge rk
+    WHERE
+      rk.is_active = TRUE
+      AND (filter_category IS NULL OR rk.category = filter_category)
+      AND (
+        rk.is_global = TRUE OR
+        (filter_tenant_id IS NOT NULL AND rk.tenant_id = filter_tenant_id)
+      )
+    ORDER BY rk.embedding::halfvec(1536) <=> query_embedding::halfvec(1536)
+    LIMIT match_count
+  ) c
+  WHERE c.similarity > match_threshold
+  ORDER BY c.similarity DESC;
+END;
+$$;
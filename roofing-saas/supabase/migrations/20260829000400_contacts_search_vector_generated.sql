@@ -0,0 +1,40 @@
+-- Migration: Generated search_vector + GIN index for contacts
+-- Date: 2026-08-29
+-- Purpose: The contacts list route filters with
+--          textSearch('search_vector', ...), but the column is a plain
+--          tsvector with no trigger or generated expression maintaining it -
+--          rows created or edited since the last one-off backfill have stale
+--          or NULL vectors and silently drop out of search results. There is
+--          also no GIN index, so the @@ match scans sequentially. Make the
+--          column GENERATED ALWAYS (matching tasks and roofing_knowledge)
+--          and index it.
+-- Rollback: ALTER TABLE contacts DROP COLUMN search_vector;
+--           ALTER TABLE contacts ADD COLUMN search_vector tsvector;
+--           DROP INDEX idx_contacts_search_vector;
+
+-- Guarded so re-running (or running against a schema where the column is
+-- already generated) is a no-op
+DO $$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_name = 'contacts'
+      AND column_name = 'search_vector'
+      AND is_generated = 'NEVER'
+  ) THEN
+    ALTER TABLE contacts DROP COLUMN search_vector;
+    ALTER TABLE contacts ADD COLUMN search_vector tsvector
+      GENERATED ALWAYS AS (
+        to_tsvector('english',
+          coalesce(first_name, '') || ' ' ||
+          coalesce(last_name, '') || ' ' ||
+          coalesce(company, '') || ' ' ||
+          coalesce(email, '') || ' ' ||
+          coalesce(phone, '')
+        )
+      ) STORED;
+  END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_contacts_search_vector
+ON contacts USING GIN (search_vector);
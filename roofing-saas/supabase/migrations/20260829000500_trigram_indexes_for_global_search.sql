@@ -0,0 +1,36 @@
+-- Migration: Trigram indexes for global search
+-- Date: 2026-08-29
+-- Purpose: The global search route (/api/search) filters with
+--          ilike '%term%' across contacts, projects, jobs, and territories.
+--          A leading wildcard disables B-tree index usage, so every search
+--          sequentially scans each table - fine at hundreds of rows, a
+--          visible stall at tens of thousands. pg_trgm GIN indexes let
+--          Postgres serve leading-wildcard ILIKE from the index, turning
+--          each probe into O(matching rows). Indexes cover the columns the
+--          search route actually touches on the two largest tables.
+-- Rollback: DROP INDEX idx_contacts_first_name_trgm; DROP INDEX idx_contacts_last_name_trgm;
+--           DROP INDEX idx_contacts_email_trgm; DROP INDEX idx_contacts_phone_trgm;
+--           DROP INDEX idx_projects_name_trgm; DROP INDEX idx_projects_number_trgm;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Contacts: first_name / last_name / email / phone (searched by /api/search)
+CREATE INDEX IF NOT EXISTS idx_contacts_first_name_trgm
+ON contacts USING GIN (first_name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_contacts_last_name_trgm
+ON contacts USING GIN (last_name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_contacts_email_trgm
+ON contacts USING GIN (email gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_contacts_phone_trgm
+ON contacts USING GIN (phone gin_trgm_ops);
+
+-- Projects: name / project_number (searched by /api/search and the projects
+-- list route's ilike filter)
+CREATE INDEX IF NOT EXISTS idx_projects_name_trgm
+ON projects USING GIN (name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_projects_number_trgm
+ON projects USING GIN (project_number gin_trgm_ops);
@@ -0,0 +1,72 @@
+-- Migration: Inner-product distance for the roofing_knowledge index
+-- Date: 2026-08-29
+-- Purpose: Every embedding in roofing_knowledge comes from OpenAI's
+--          text-embedding models, which return unit-length vectors. For
+--          unit vectors, inner-product ordering is identical to cosine
+--          ordering but skips the two norm computations per distance
+--          - fewer FLOPs inside every HNSW graph hop. Switch the halfvec
+--          expression index to the inner-product opclass and probe with
+--          <#>; the similarity value returned to callers is still the
+--          full-precision cosine, so results and scores are unchanged.
+-- Note: knowledge_base is untouched - it stays on the plain HNSW cosine
+--       index from 20260829000200 because its consumer, match_documents,
+--       lives in the cloud schema and orders by the raw column (see the
+--       note in 20260829000300).
+-- Requires: pgvector >= 0.7 (halfvec type)
+-- Note: only valid while all stored embeddings are L2-normalized, which
+--       OpenAI guarantees. If a non-normalized source is ever added, revert
+--       to the cosine opclass.
+-- Rollback: Re-apply 20260829000300_halfvec_knowledge_indexes.sql
+
+DROP INDEX IF EXISTS idx_roofing_knowledge_embedding;
+CREATE INDEX idx_roofing_knowledge_embedding ON roofing_knowledge
+USING hnsw ((embedding::halfvec(1536)) halfvec_ip_ops)
+WITH (m = 16, ef_construction = 64);
+
+-- Probe with inner product (<#>) so the planner can use the ip-opclass
+-- expression index; similarity stays full-precision cosine
+CREATE OR REPLACE FUNCTION search_roofing_knowledge(
+  query_embedding vector(1536),
+  match_threshold float DEFAULT 0.7,
+  match_count int DEFAULT 5,
+  filter_category text DEFAULT NULL,
+  filter_tenant_id uuid DEFAULT NULL
+)
+RETURNS TABLE (
+  id uuid,
+  title text,
+  content text,
+  category text,
+  subcategory text,
+  manufacturer text,
+  similarity float
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  RETURN QUERY
+  SELECT c.id, c.title, c.content, c.category, c.subcategory, c.manufacturer, c.similarity
+  FROM (
+    SELECT
+      rk.id,
+      rk.title,
+      rk.content,
+      rk.category,
+      rk.subcategory,
+      rk.manufacturer,
+      1 - (rk.embedding <=> query_embedding) AS similarity
+    FROM roofing_knowledge rk
+    WHERE
+      rk.is_active = TRUE
+      AND (filter_category IS NULL OR rk.category = filter_category)
+      AND (
+        rk.is_global = TRUE OR
+        (filter_tenant_id IS NOT NULL AND rk.tenant_id = filter_tenant_id)
+      )
+    ORDER BY rk.embedding::halfvec(1536) <#> query_embedding::halfvec(1536)
+    LIMIT match_count
+  ) c
+  WHERE c.similarity > match_threshold
+  ORDER BY c.similarity DESC;
+END;
+$$;
@@ -0,0 +1,134 @@
+/**
+ * Unit tests for the OpenAI embeddings service
+ *
+ * The batch path layers dedup fan-out, length-sorted packing, per-batch
+ * index remapping, and a final scatter back to caller order - an off-by-one
+ * anywhere in that chain corrupts stored vectors silently, so order
+ * preservation is the main thing under test here.
+ */
+
+import { describe, it, expect, vi, beforeEach } from 'vitest'
+import {
+  generateEmbedding,
+  generateEmbeddings,
+  serializeEmbedding,
+} from '@/lib/embeddings'
+
+vi.hoisted(() => {
+  process.env.OPENAI_API_KEY = 'test-key'
+})
+
+// Mock logger
+vi.mock('@/lib/logger', () => ({
+  logger: {
+    info: vi.fn(),
+    warn: vi.fn(),
+    error: vi.fn(),
+    debug: vi.fn(),
+  },
+}))
+
+// Deterministic fake embedding derived from the input text, so any index
+// mixup shows up as a value mismatch
+function embeddingFor(text: string): number[] {
+  return [text.length, text.charCodeAt(0), 3, 7]
+}
+
+// base64-encoded float32, the way the API responds to encoding_format: 'base64'
+function encodeBase64(values: number[]): string {
+  return Buffer.from(new Float32Array(values).buffer).toString('base64')
+}
+
+const fetchMock = vi.fn(async (_url: string, init: { body: string }) => {
+  const body = JSON.parse(init.body)
+  const inputs: string[] = Array.isArray(body.input) ? body.input : [body.input]
+  return {
+    ok: true,
+    status: 200,
+    headers: { get: () => null },
+    json: async () => ({
+      data: inputs.map((text, index) => ({
+        index,
+        embedding: encodeBase64(embeddingFor(text)),
+      })),
+      usage: { total_tokens: inputs.length },
+    }),
+    text: async () => '',
+  }
+})
+
+vi.stubGlobal('fetch', fetchMock)
+
+describe('generateEmbeddings()', () => {
+  beforeEach(() => {
+    fetchMock.mockClear()
+  })
+
+  it('preserves caller order with duplicates across multiple batches', async () => {
+    // 120 unique texts forces two API batches (100-input limit); varying
+    // lengths exercise the length-sorted packing, and duplicates of early
+    // inputs sit at the end so the fan-out crosses batch boundaries
+    const unique = Array.from(
+      { length: 120 },
+      (_, i) => `text-${'x'.repeat(i % 37)}-${i}`
+    )
+    const texts = [...unique, unique[0], unique[57], unique[119], unique[3]]
+
+    const result = await generateEmbeddings(texts)
+
+    expect(result).not.toBeNull()
+    expect(result!.embeddings).toHaveLength(texts.length)
+    texts.forEach((text, i) => {
+      expect(result!.embeddings[i]).toEqual(embeddingFor(text))
+    })
+
+    // Duplicates are fanned out from the first occurrence, not re-embedded
+    expect(fetchMock).toHaveBeenCalledTimes(2)
+    const embeddedInputs = fetchMock.mock.calls.flatMap(
+      ([, init]) => JSON.parse(init.body).input as string[]
+    )
+    expect(embeddedInputs).toHaveLength(unique.length)
+    expect(result!.totalTokens).toBe(unique.length)
+  })
+
+  it('returns an empty result without calling the API for no inputs', async () => {
+    const result = await generateEmbeddings([])
+
+    expect(result).toEqual({ embeddings: [], totalTokens: 0 })
+    expect(fetchMock).not.toHaveBeenCalled()
+  })
+})
+
+describe('generateEmbedding() cache', () => {
+  beforeEach(() => {
+    fetchMock.mockClear()
+  })
+
+  it('serves whitespace/case variants of a query from one cache entry', async () => {
+    const first = await generateEmbedding('GAF warranty coverage')
+    const second = await generateEmbedding('  gaf  WARRANTY   coverage ')
+
+    expect(first).not.toBeNull()
+    expect(second).not.toBeNull()
+    expect(second!.embedding).toEqual(first!.embedding)
+    // Cache hits cost no tokens and no API round trip
+    expect(second!.tokens).toBe(0)
+    expect(fetchMock).toHaveBeenCalledTimes(1)
+  })
+})
+
+describe('serializeEmbedding()', () => {
+  it('round-trips through pgvector text form within float32 precision', () => {
+    const embedding = [0.0123456789, -0.987654321, 1, 0, -3.5e-5]
+    const serialized = serializeEmbedding(embedding)
+
+    expect(serialized.startsWith('[')).toBe(true)
+    expect(serialized.endsWith(']')).toBe(true)
+
+    const parsed = serialized.slice(1, -1).split(',').map(Number)
+    expect(parsed).toHaveLength(embedding.length)
+    parsed.forEach((value, i) => {
+      expect(value).toBeCloseTo(embedding[i], 6)
+    })
+  })
+})